@@ -1,20 +1,18 @@
 # from .logs.logger import get_logger
-from .src.config import (
-    build_import_string,
-    load_envs,
-    print_envs,
-)
-from .src.utils.python.init_gen import (
-    extract_names,
-    get_relative_import_path,
-    process_directory,
-    generate,
-)
-from .src.utils.version import (
-    BumpType,
-    bump_version,
-    bump,
-)
+import importlib
+
+_LAZY_IMPORTS = {
+    "build_import_string": ".src.config",
+    "load_envs": ".src.config",
+    "print_envs": ".src.config",
+    "extract_names": ".src.utils.python.init_gen",
+    "get_relative_import_path": ".src.utils.python.init_gen",
+    "process_directory": ".src.utils.python.init_gen",
+    "generate": ".src.utils.python.init_gen",
+    "BumpType": ".src.utils.version",
+    "bump_version": ".src.utils.version",
+    "bump": ".src.utils.version",
+}
 
 __all__ = [
     #    "get_logger",
@@ -30,3 +28,15 @@ __all__ = [
     "print_envs",
 ]
 
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
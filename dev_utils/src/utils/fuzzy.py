@@ -0,0 +1,103 @@
+from typing import List, Optional, Tuple
+
+SEPARATORS = "/_-. "
+
+
+def _score_term(text: str, base: int, term: str) -> Optional[int]:
+    """
+    Score how well one lowercase term matches a lowercase string.
+
+    Substring matches in the last path segment (starting at `base`) rank
+    highest, then substring matches anywhere, then subsequence matches
+    (again preferring the last segment), which earn bonuses for consecutive
+    characters and segment starts.
+
+    Returns:
+        The score, or None if the term does not match
+    """
+    pos = text.find(term, base)
+    if pos >= 0:
+        return 300 - (pos - base) + (50 if pos == base else 0)
+
+    pos = text.find(term)
+    if pos >= 0:
+        at_segment = pos == 0 or text[pos - 1] in SEPARATORS
+        return 200 - pos // 10 + (30 if at_segment else 0)
+
+    # Prefer a subsequence within the last path segment
+    score = _score_subsequence(text, base, term)
+    if score is not None:
+        return score + 50
+    return _score_subsequence(text, 0, term)
+
+
+def _score_subsequence(text: str, start: int, term: str) -> Optional[int]:
+    score = 100
+    prev = start - 1
+    for char in term:
+        pos = text.find(char, prev + 1)
+        if pos < 0:
+            return None
+        if pos == prev + 1:
+            score += 5
+        elif text[pos - 1] in SEPARATORS:
+            score += 3
+        else:
+            score -= min(pos - prev, 10)
+        prev = pos
+    return score
+
+
+class FuzzyIndex:
+    """
+    Incremental fuzzy matcher over a fixed list of strings.
+
+    Lowercased strings and the start of their last path segment are computed
+    once. Space-separated query terms must all match. Results of earlier
+    queries are kept, so a query that extends a previous one (typing) only
+    re-scores that query's matches, and deleting characters returns to a
+    cached result instead of rescanning everything.
+    """
+
+    def __init__(self, items: List[str]):
+        self.items = items
+        self._lower = [item.lower() for item in items]
+        self._base = [text.rfind("/") + 1 for text in self._lower]
+        # Stack of (query, matching positions in item order)
+        self._history: List[Tuple[str, List[int]]] = [("", list(range(len(items))))]
+
+    def score(self, position: int, query: str) -> Optional[int]:
+        """Score one item against a lowercase query; None if it does not match."""
+        text = self._lower[position]
+        base = self._base[position]
+        total = 0
+        for term in query.split():
+            term_score = _score_term(text, base, term)
+            if term_score is None:
+                return None
+            total += term_score
+        return total
+
+    def search(self, query: str) -> List[int]:
+        """
+        Return the positions of matching items, best match first.
+
+        An empty query returns every item in its original order.
+        """
+        query = query.lower().strip()
+        while not query.startswith(self._history[-1][0]):
+            self._history.pop()
+        previous_query, candidates = self._history[-1]
+        if not query:
+            return list(candidates)
+
+        scores = {}
+        for position in candidates:
+            score = self.score(position, query)
+            if score is not None:
+                scores[position] = score
+        if query != previous_query:
+            self._history.append((query, list(scores)))
+
+        # sorted() is stable, so ties keep their original order
+        return sorted(scores, key=lambda position: -scores[position])
@@ -0,0 +1,323 @@
+import os
+import json
+import socket
+import tempfile
+import threading
+import socketserver
+from time import sleep
+from typing import Dict, List, Optional, Tuple
+
+from pynvim import attach
+
+from dev_utils.src.utils.nvim.instances import discover_sockets
+
+NOTIFICATION = "dev_utils_buffers"
+RESCAN_INTERVAL = 10.0
+
+# Shared by the initial snapshot and the autocmd callback, so both report
+# buffers in the same shape as nvim/buffers.py's BUFFER_INFO_LUA
+BUFFER_STATE_LUA = """
+local function buffer_state(buf)
+  if not vim.api.nvim_buf_is_valid(buf) then
+    return {number = buf, valid = false}
+  end
+  local info = vim.fn.getbufinfo(buf)[1]
+  return {
+    number = buf,
+    valid = true,
+    path = info.name,
+    filename = info.name ~= "" and vim.fn.fnamemodify(info.name, ":~:.") or "",
+    line = info.lnum,
+    listed = info.listed == 1,
+    loaded = info.loaded == 1,
+    hidden = info.hidden == 1,
+    modified = info.changed == 1,
+    modifiable = vim.bo[buf].modifiable,
+    readonly = vim.bo[buf].readonly,
+  }
+end
+
+local function editor_state()
+  return {current = vim.api.nvim_get_current_buf(), alternate = vim.fn.bufnr("#")}
+end
+"""
+
+SNAPSHOT_LUA = BUFFER_STATE_LUA + """
+local state = editor_state()
+state.buffers = {}
+for _, buf in ipairs(vim.api.nvim_list_bufs()) do
+  table.insert(state.buffers, buffer_state(buf))
+end
+return state
+"""
+
+# Sends the state of a buffer after every event that can change it. Sending is
+# deferred with vim.schedule so the state is read once the event has settled.
+# If the daemon goes away the autocmds remove themselves.
+SUBSCRIBE_LUA = BUFFER_STATE_LUA + """
+local chan = ...
+local group = vim.api.nvim_create_augroup("DevUtilsBufferDaemon" .. chan, {clear = true})
+vim.api.nvim_create_autocmd({
+  "BufAdd", "BufDelete", "BufWipeout", "BufModifiedSet", "BufFilePost",
+  "BufEnter", "BufWinEnter", "BufWinLeave", "BufUnload",
+}, {
+  group = group,
+  callback = function(ev)
+    vim.schedule(function()
+      local state = editor_state()
+      state.buffer = buffer_state(ev.buf)
+      if not pcall(vim.rpcnotify, chan, "%s", state) then
+        pcall(vim.api.nvim_del_augroup_by_id, group)
+      end
+    end)
+  end,
+})
+""" % NOTIFICATION
+
+
+def default_daemon_socket() -> str:
+    """Path of the daemon's Unix socket."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "dev_utils-buffers.sock")
+    return os.path.join(
+        tempfile.gettempdir(), f"dev_utils-{os.getuid()}", "buffers.sock"
+    )
+
+
+class BufferIndex:
+    """Thread-safe in-memory state of the buffers of several Neovim instances."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, Dict[int, dict]] = {}
+        self._editor: Dict[str, dict] = {}
+        self._sockets: Dict[str, str] = {}
+
+    def reset(self, instance: str, socket_path: str, snapshot: dict) -> None:
+        with self._lock:
+            self._sockets[instance] = socket_path
+            self._editor[instance] = {
+                "current": snapshot["current"],
+                "alternate": snapshot["alternate"],
+            }
+            self._buffers[instance] = {
+                buf["number"]: buf for buf in snapshot["buffers"] if buf["valid"]
+            }
+
+    def update(self, instance: str, state: dict) -> None:
+        with self._lock:
+            buffers = self._buffers.get(instance)
+            if buffers is None:
+                return
+            self._editor[instance] = {
+                "current": state["current"],
+                "alternate": state["alternate"],
+            }
+            buf = state["buffer"]
+            if buf["valid"]:
+                buffers[buf["number"]] = buf
+            else:
+                buffers.pop(buf["number"], None)
+
+    def remove(self, instance: str) -> None:
+        with self._lock:
+            self._buffers.pop(instance, None)
+            self._editor.pop(instance, None)
+            self._sockets.pop(instance, None)
+
+    def instances(self) -> List[str]:
+        with self._lock:
+            return list(self._buffers)
+
+    def buffers(self, instance: Optional[str] = None) -> Optional[List[dict]]:
+        """
+        Return buffer states ordered by instance and buffer number.
+
+        Returns:
+            None if a specific instance was asked for but is not indexed
+        """
+        with self._lock:
+            return self._buffer_states(instance)
+
+    def listing(self) -> Tuple[List[dict], Dict[str, str]]:
+        """Return every buffer state and each indexed instance's socket, consistently."""
+        with self._lock:
+            sockets = {name: self._sockets[name] for name in self._buffers}
+            return self._buffer_states(None), sockets
+
+    def _buffer_states(self, instance: Optional[str]) -> Optional[List[dict]]:
+        if instance is not None and instance not in self._buffers:
+            return None
+        names = [instance] if instance is not None else list(self._buffers)
+        result = []
+        for name in names:
+            editor = self._editor[name]
+            for number in sorted(self._buffers[name]):
+                result.append(
+                    {
+                        **self._buffers[name][number],
+                        "instance": name,
+                        "socket": self._sockets[name],
+                        "current": number == editor["current"],
+                        "alternate": number == editor["alternate"],
+                    }
+                )
+        return result
+
+
+def watch_instance(index: BufferIndex, instance: str, socket_path: str) -> None:
+    """Keep an instance's buffers in the index until its Neovim exits."""
+    try:
+        # A dedicated connection: run_loop blocks it for the daemon's lifetime
+        nvim = attach("socket", path=socket_path)
+        nvim.exec_lua(SUBSCRIBE_LUA, nvim.channel_id)
+        index.reset(instance, socket_path, nvim.exec_lua(SNAPSHOT_LUA))
+
+        def on_notification(name, args):
+            if name == NOTIFICATION and args:
+                index.update(instance, args[0])
+
+        nvim.run_loop(None, on_notification)
+    except Exception as e:
+        print(f"Stopped watching {instance}: {e}")
+    finally:
+        index.remove(instance)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    response = {"ok": False, "error": "request must be a JSON object"}
+                elif request.get("op") == "ping":
+                    response = {"ok": True, "instances": self.server.index.instances()}
+                elif request.get("op") == "buffers" and request.get("instance") is None:
+                    # With the indexed sockets, so clients can query the others directly
+                    buffers, sockets = self.server.index.listing()
+                    response = {"ok": True, "buffers": buffers, "sockets": sockets}
+                elif request.get("op") == "buffers":
+                    buffers = self.server.index.buffers(request.get("instance"))
+                    response = {"ok": buffers is not None, "buffers": buffers}
+                else:
+                    response = {
+                        "ok": False,
+                        "error": f"unknown op {request.get('op')!r}",
+                    }
+            except ValueError as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class BufferDaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, index: BufferIndex):
+        self.index = index
+        super().__init__(socket_path, _RequestHandler)
+
+
+def serve(socket_path: Optional[str] = None) -> None:
+    """
+    Run the buffer daemon in the foreground.
+
+    Every discovered Neovim instance is watched in its own thread; new
+    instances are picked up every RESCAN_INTERVAL seconds.
+    """
+    socket_path = socket_path or default_daemon_socket()
+    if query_daemon({"op": "ping"}, socket_path) is not None:
+        raise RuntimeError(f"A buffer daemon is already listening on {socket_path}")
+    os.makedirs(os.path.dirname(socket_path), mode=0o700, exist_ok=True)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Left behind by a daemon that did not exit cleanly
+
+    index = BufferIndex()
+    server = BufferDaemonServer(socket_path, index)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Buffer daemon listening on {socket_path}")
+
+    watchers: Dict[str, threading.Thread] = {}
+    try:
+        while True:
+            for instance, path in discover_sockets().items():
+                if instance in watchers and watchers[instance].is_alive():
+                    continue
+                print(f"Watching {instance} ({path})")
+                watchers[instance] = threading.Thread(
+                    target=watch_instance, args=(index, instance, path), daemon=True
+                )
+                watchers[instance].start()
+            sleep(RESCAN_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def query_daemon(
+    request: dict, socket_path: Optional[str] = None, timeout: float = 0.5
+) -> Optional[dict]:
+    """
+    Send one request to the buffer daemon.
+
+    Returns:
+        The response, or None if no daemon is listening
+    """
+    socket_path = socket_path or default_daemon_socket()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                return json.loads(reader.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def get_daemon_buffers(
+    instance: Optional[str] = None, socket_path: Optional[str] = None
+) -> Optional[List[dict]]:
+    """
+    Get buffer states from the daemon.
+
+    Returns:
+        None when the daemon is not running or does not index the instance,
+        so callers can fall back to querying Neovim directly
+    """
+    response = query_daemon({"op": "buffers", "instance": instance}, socket_path)
+    if not response or not response.get("ok"):
+        return None
+    return response["buffers"]
+
+
+def get_daemon_index(
+    sockets: Dict[str, str], socket_path: Optional[str] = None
+) -> Optional[Tuple[List[dict], Dict[str, str]]]:
+    """
+    Get the buffer states of every instance the daemon indexes.
+
+    The daemon only picks up new instances every RESCAN_INTERVAL seconds, so
+    the running instances are compared with the ones it has indexed.
+
+    Args:
+        sockets: Running instances, as returned by discover_sockets
+
+    Returns:
+        The buffer states and the instances of `sockets` the daemon does not
+        index (yet), to be queried directly; None when no daemon is running
+    """
+    response = query_daemon({"op": "buffers", "instance": None}, socket_path)
+    if not response or not response.get("ok") or "sockets" not in response:
+        return None
+    indexed = {os.path.realpath(path) for path in response["sockets"].values()}
+    missing = {
+        name: path
+        for name, path in sockets.items()
+        if os.path.realpath(path) not in indexed
+    }
+    return response["buffers"], missing
@@ -1,20 +1,97 @@
-from pynvim import attach
+from pynvim.api import NvimError
 import os
 import json
+import argparse
+from time import perf_counter
 from typing import List, Dict, Optional
 
-from dev_utils.src.utils.nvim.nvim_init import NVIM_SOCKET_DEV, NVIM_SOCKET_NOTES
+from dev_utils.src.utils.nvim.buffer_daemon import get_daemon_buffers, get_daemon_index
+from dev_utils.src.utils.nvim.connection import get_connection, get_manager
+from dev_utils.src.utils.nvim.instances import discover_sockets, query_instances
+from dev_utils.src.utils.nvim.nvim_init import get_dev_socket
+
+# Everything :buffers shows, fetched with one RPC request
+BUFFER_INFO_LUA = """
+local current = vim.api.nvim_get_current_buf()
+local alternate = vim.fn.bufnr("#")
+local buffers = {}
+for _, info in ipairs(vim.fn.getbufinfo({buflisted = 1})) do
+  local buf = info.bufnr
+  table.insert(buffers, {
+    number = buf,
+    path = info.name,
+    filename = info.name ~= "" and vim.fn.fnamemodify(info.name, ":~:.") or "",
+    line = info.lnum,
+    current = buf == current,
+    alternate = buf == alternate,
+    loaded = info.loaded == 1,
+    hidden = info.hidden == 1,
+    modified = info.changed == 1,
+    modifiable = vim.bo[buf].modifiable,
+    readonly = vim.bo[buf].readonly,
+  })
+end
+return buffers
+"""
+
+
+def buffer_entry_from_info(info: dict) -> Dict[str, str]:
+    """Convert structured buffer state into the format parsed from :buffers."""
+    # Rebuild the indicator columns of :buffers
+    flags = "%" if info["current"] else "#" if info["alternate"] else ""
+    if info["loaded"]:
+        flags += "h" if info["hidden"] else "a"
+    if not info["modifiable"]:
+        flags += "-"
+    elif info["readonly"]:
+        flags += "="
+    if info["modified"]:
+        flags += "+"
+
+    return {
+        "number": str(info["number"]),
+        "flags": flags,
+        "filename": info["filename"] or "[No Name]",
+        "path": info["path"],
+        "line": str(info["line"]),
+        "active": info["current"],
+        "modified": info["modified"],
+        "hidden": info["hidden"],
+    }
+
+
+def daemon_entries(states: List[dict], tag_instance: bool) -> List[Dict]:
+    """Convert listed buffer states from the daemon into buffer entries."""
+    buffers = []
+    for state in states:
+        if state["listed"]:
+            entry = buffer_entry_from_info(state)
+            if tag_instance:
+                entry.update(instance=state["instance"], socket=state["socket"])
+            buffers.append(entry)
+    return buffers
+
+
+def get_daemon_buffer_list(instance: Optional[str] = None) -> Optional[List[Dict]]:
+    """Get listed buffers from the buffer daemon, or None if it cannot answer."""
+    states = get_daemon_buffers(instance)
+    if states is None:
+        return None
+    return daemon_entries(states, instance is None)
 
 
 class NeovimBufferLister:
-    def __init__(self, socket_path: Optional[str] = None):
+    def __init__(self, socket_path: Optional[str] = None, nvim=None):
         """
         Initialize connection to Neovim.
 
         Args:
             socket_path: Path to Neovim socket. If None, will try to find from $NVIM_LISTEN_ADDRESS
+            nvim: Existing Neovim connection to use instead of connecting
         """
-        self.nvim = self._connect_to_nvim(socket_path)
+        # Set when the lister owns a pooled connection, so it can reconnect
+        self.socket_path: Optional[str] = None
+        self.nvim = nvim if nvim is not None else self._connect_to_nvim(socket_path)
 
     def _connect_to_nvim(self, socket_path: Optional[str] = None):
         """
@@ -54,11 +131,53 @@ class NeovimBufferLister:
         if not os.path.exists(socket_path):
             raise FileNotFoundError(f"Neovim socket not found at {socket_path}")
 
-        sesh = attach("socket", path=socket_path)
+        sesh = get_connection(socket_path)
+        self.socket_path = socket_path
         # print(f"\n\nSession: {sesh}\n\n")
         return sesh
 
-    def get_buffer_list(self) -> List[Dict[str, str]]:
+    def get_buffer_list(self, structured: bool = True) -> List[Dict[str, str]]:
+        """
+        Get the listed buffers, as shown by :buffers.
+
+        Args:
+            structured: Fetch buffer details with getbufinfo() in one request.
+                Falls back to parsing :buffers output if that fails.
+
+        Returns:
+            List of dictionaries containing buffer information
+        """
+        if self.socket_path is None:
+            return self._get_buffer_list(structured)
+
+        def fetch(nvim) -> List[Dict[str, str]]:
+            # A new connection if the pooled one was lost
+            self.nvim = nvim
+            return self._get_buffer_list(structured)
+
+        return get_manager().run(self.socket_path, fetch)
+
+    def _get_buffer_list(self, structured: bool) -> List[Dict[str, str]]:
+        if structured:
+            try:
+                return self._get_structured_buffer_list()
+            except NvimError:
+                pass
+        return self._get_legacy_buffer_list()
+
+    def _get_structured_buffer_list(self) -> List[Dict[str, str]]:
+        """
+        Get buffer details from getbufinfo() with a single nvim_exec_lua call.
+
+        Returns:
+            List of dictionaries in the same format as _parse_buffer_output
+        """
+        return [
+            buffer_entry_from_info(info)
+            for info in self.nvim.exec_lua(BUFFER_INFO_LUA) or []
+        ]
+
+    def _get_legacy_buffer_list(self) -> List[Dict[str, str]]:
         """
         Execute :buffers command and parse its output.
 
@@ -139,14 +258,95 @@ class NeovimBufferLister:
         return buffers
 
 
+def benchmark_buffer_list(
+    buffer_lister: NeovimBufferLister, iterations: int = 50
+) -> Dict[str, float]:
+    """
+    Time the structured and legacy buffer listing.
+
+    Returns:
+        Mean milliseconds per listing for each mode
+    """
+    timings = {}
+    for mode, structured in (("structured", True), ("legacy", False)):
+        buffer_lister.get_buffer_list(structured=structured)  # Warm up
+        start = perf_counter()
+        for _ in range(iterations):
+            buffer_lister.get_buffer_list(structured=structured)
+        timings[mode] = (perf_counter() - start) * 1000 / iterations
+    return timings
+
+
 def main():
-    try:
-        # Create buffer lister instance
-        buffer_lister = NeovimBufferLister(socket_path=NVIM_SOCKET_DEV)
+    parser = argparse.ArgumentParser(description="List buffers of the dev Neovim")
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Parse :buffers output instead of using getbufinfo()",
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="N",
+        help="Compare structured and legacy listing over N iterations",
+    )
+    parser.add_argument(
+        "-a",
+        "--all-instances",
+        action="store_true",
+        help="List buffers of every running Neovim instance",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=2.0,
+        help="Seconds to wait for each instance with --all-instances (default: 2)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Query Neovim directly even if the buffer daemon is running",
+    )
+    args = parser.parse_args()
 
-        print(f"\nBuffer_lister: {buffer_lister}\n")
-        # Get and display buffer list
-        buffers = buffer_lister.get_buffer_list()
+    try:
+        buffers = None
+        use_daemon = not (args.no_daemon or args.legacy or args.bench)
+        if use_daemon and not args.all_instances:
+            buffers = get_daemon_buffer_list("dev")
+
+        if args.all_instances:
+            sockets = discover_sockets()
+            buffers = []
+            indexed = get_daemon_index(sockets) if use_daemon else None
+            if indexed is not None:
+                # Instances the daemon has not indexed (yet) are queried directly
+                states, sockets = indexed
+                buffers = daemon_entries(states, True)
+            if sockets:
+                found, errors = query_instances(
+                    sockets,
+                    lambda nvim: NeovimBufferLister(nvim=nvim).get_buffer_list(
+                        structured=not args.legacy
+                    ),
+                    args.timeout,
+                )
+                for instance, error in errors.items():
+                    print(f"Skipped instance {instance}: {error}")
+                buffers.extend(found)
+        elif buffers is None:
+            # Create buffer lister instance
+            buffer_lister = NeovimBufferLister(socket_path=get_dev_socket())
+
+            if args.bench:
+                timings = benchmark_buffer_list(buffer_lister, args.bench)
+                for mode, elapsed in timings.items():
+                    print(f"{mode:<10} {elapsed:.3f} ms per listing")
+                return 0
+
+            print(f"\nBuffer_lister: {buffer_lister}\n")
+            # Get and display buffer list
+            buffers = buffer_lister.get_buffer_list(structured=not args.legacy)
 
         # Print in both human-readable and JSON formats
         print("Buffer List:")
@@ -160,7 +360,8 @@ def main():
             if buf["hidden"]:
                 status.append("hidden")
 
-            print(f"Buffer {buf['number']}: {buf['filename']}")
+            instance = f" [{buf['instance']}]" if "instance" in buf else ""
+            print(f"Buffer {buf['number']}{instance}: {buf['filename']}")
             print(f"  Line: {buf['line']}")
             print(f"  Status: {', '.join(status) if status else 'normal'}")
             print()
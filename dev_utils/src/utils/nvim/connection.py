@@ -0,0 +1,188 @@
+import atexit
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import monotonic, perf_counter
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+from pynvim import attach
+from pynvim.api import Nvim
+
+# Errors that mean the socket connection itself is gone
+CONNECTION_ERRORS = (OSError, EOFError)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ConnectionStats:
+    """Timing counters for one socket, to separate connection from call overhead."""
+
+    connects: int = 0
+    reconnects: int = 0
+    handshake_seconds: float = 0.0
+    calls: int = 0
+    call_seconds: float = 0.0
+
+    @property
+    def mean_handshake_ms(self) -> float:
+        return self.handshake_seconds * 1000 / self.connects if self.connects else 0.0
+
+    @property
+    def mean_call_ms(self) -> float:
+        return self.call_seconds * 1000 / self.calls if self.calls else 0.0
+
+
+class NvimConnectionManager:
+    """
+    Keeps one reusable Neovim RPC connection per socket path.
+
+    Connections are created on first use and health-checked with
+    nvim_get_mode (which never blocks on user input) when they have been idle
+    for longer than `check_interval` seconds. Dead connections are replaced.
+    The manager can be used as a context manager to close everything on exit.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self.stats: Dict[str, ConnectionStats] = {}
+        self._connections: Dict[str, Nvim] = {}
+        self._last_used: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "NvimConnectionManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close_all()
+
+    def _socket_lock(self, socket_path: str) -> threading.Lock:
+        with self._lock:
+            if socket_path not in self._locks:
+                self._locks[socket_path] = threading.Lock()
+                self.stats.setdefault(socket_path, ConnectionStats())
+            return self._locks[socket_path]
+
+    def _is_healthy(self, socket_path: str, nvim: Nvim) -> bool:
+        if monotonic() - self._last_used.get(socket_path, 0.0) < self.check_interval:
+            return True
+        try:
+            nvim.request("nvim_get_mode")
+        except CONNECTION_ERRORS:
+            return False
+        return True
+
+    def get(self, socket_path: str) -> Nvim:
+        """
+        Return a live connection to the Neovim listening on socket_path.
+
+        Raises:
+            Whatever pynvim.attach raises when no connection can be made
+        """
+        with self._socket_lock(socket_path):
+            stats = self.stats[socket_path]
+            nvim = self._connections.get(socket_path)
+            if nvim is not None:
+                if self._is_healthy(socket_path, nvim):
+                    self._last_used[socket_path] = monotonic()
+                    return nvim
+                self._close(socket_path)
+                stats.reconnects += 1
+
+            start = perf_counter()
+            nvim = attach("socket", path=socket_path)
+            stats.handshake_seconds += perf_counter() - start
+            stats.connects += 1
+
+            self._connections[socket_path] = nvim
+            self._last_used[socket_path] = monotonic()
+            return nvim
+
+    @contextmanager
+    def track(self, socket_path: str) -> Iterator[None]:
+        """Count the time spent in the block as RPC call time for socket_path."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.stats.setdefault(socket_path, ConnectionStats())
+            stats.calls += 1
+            stats.call_seconds += perf_counter() - start
+
+    def run(self, socket_path: str, fn: Callable[[Nvim], T]) -> T:
+        """
+        Run `fn` with the connection, reconnecting and retrying once if it was lost.
+
+        A pooled connection can die between health checks; this turns that
+        into one reconnect instead of an error. `fn` should be safe to repeat.
+
+        Args:
+            socket_path: Socket of the Neovim instance
+            fn: Function making RPC requests on the connection it is given
+        """
+        nvim = self.get(socket_path)
+        try:
+            with self.track(socket_path):
+                return fn(nvim)
+        except CONNECTION_ERRORS:
+            self.close(socket_path)
+            nvim = self.get(socket_path)
+            with self._socket_lock(socket_path):
+                self.stats[socket_path].reconnects += 1
+            with self.track(socket_path):
+                return fn(nvim)
+
+    def call(self, socket_path: str, method: str, *args, **kwargs):
+        """
+        Send an RPC request, reconnecting once if the connection was lost.
+
+        Args:
+            socket_path: Socket of the Neovim instance
+            method: API method name, e.g. "nvim_exec_lua"
+        """
+        return self.run(socket_path, lambda nvim: nvim.request(method, *args, **kwargs))
+
+    def _close(self, socket_path: str) -> None:
+        nvim = self._connections.pop(socket_path, None)
+        self._last_used.pop(socket_path, None)
+        if nvim is not None:
+            try:
+                nvim.close()
+            except Exception:
+                pass
+
+    def discard(self, socket_path: str) -> None:
+        """Forget a connection without closing it, e.g. one stuck in a request."""
+        with self._lock:
+            self._connections.pop(socket_path, None)
+            self._last_used.pop(socket_path, None)
+            # A thread may still hold the old lock; later callers get a new one
+            self._locks.pop(socket_path, None)
+
+    def close(self, socket_path: str) -> None:
+        """Close the connection to one socket, if open."""
+        with self._socket_lock(socket_path):
+            self._close(socket_path)
+
+    def close_all(self) -> None:
+        """Close every open connection."""
+        for socket_path in list(self._connections):
+            self.close(socket_path)
+
+
+_manager: Optional[NvimConnectionManager] = None
+
+
+def get_manager() -> NvimConnectionManager:
+    """Return the connection manager shared by all dev_utils commands."""
+    global _manager
+    if _manager is None:
+        _manager = NvimConnectionManager()
+        atexit.register(_manager.close_all)
+    return _manager
+
+
+def get_connection(socket_path: str) -> Nvim:
+    """Return a pooled connection to the Neovim listening on socket_path."""
+    return get_manager().get(socket_path)
@@ -0,0 +1,106 @@
+import os
+import tempfile
+from pathlib import Path
+from time import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+MAX_ENTRIES = 500
+HALF_LIFE = 3 * 24 * 60 * 60  # Seconds until an access counts half as much
+
+
+def default_store_path() -> Path:
+    """Return the frecency log used when none is given."""
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        Path.home(), ".local", "share"
+    )
+    return Path(base) / "dev_utils" / "buffer_frecency.log"
+
+
+class FrecencyStore:
+    """
+    Access history of file paths, ranked by frequency and recency.
+
+    The history is an append-only log of "<last access>\\t<count>\\t<path>"
+    lines, so recording a pick is a single append. The log is only read when
+    a ranking is needed; lines for the same path are then merged, and when
+    the log has grown to twice the number of paths it is rewritten in merged
+    form. Only the MAX_ENTRIES highest-scoring paths are kept.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path or default_store_path())
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, Tuple[float, int]]] = None
+
+    def record(self, paths: Iterable[str], now: Optional[float] = None) -> None:
+        """Append an access for each path."""
+        now = time() if now is None else now
+        paths = [path for path in paths if path and "\n" not in path]
+        lines = [f"{now:.0f}\t1\t{path}\n" for path in paths]
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.writelines(lines)
+        if self._entries is not None:
+            for path in paths:
+                last, count = self._entries.get(path, (0.0, 0))
+                self._entries[path] = (max(last, now), count + 1)
+
+    def _load(self) -> Dict[str, Tuple[float, int]]:
+        entries = {}
+        line_count = 0
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    line_count += 1
+                    try:
+                        last, count, path = line.rstrip("\n").split("\t", 2)
+                        last, count = float(last), int(count)
+                    except ValueError:
+                        continue
+                    previous_last, previous_count = entries.get(path, (0.0, 0))
+                    entries[path] = (max(previous_last, last), previous_count + count)
+        except OSError:
+            return {}
+
+        if len(entries) > self.max_entries:
+            now = time()
+            keep = sorted(
+                entries, key=lambda path: self._score(entries[path], now), reverse=True
+            )[: self.max_entries]
+            entries = {path: entries[path] for path in keep}
+        if line_count > 2 * len(entries):
+            self._compact(entries)
+        return entries
+
+    def _compact(self, entries: Dict[str, Tuple[float, int]]) -> None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                for path, (last, count) in entries.items():
+                    f.write(f"{last:.0f}\t{count}\t{path}\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _score(entry: Tuple[float, int], now: float) -> float:
+        last, count = entry
+        return count * 0.5 ** (max(0.0, now - last) / HALF_LIFE)
+
+    def scores(self) -> Dict[str, float]:
+        """Return the frecency score of every known path."""
+        if self._entries is None:
+            self._entries = self._load()
+        now = time()
+        return {path: self._score(entry, now) for path, entry in self._entries.items()}
+
+    def rank(self, items: List[T], key: Callable[[T], str] = str) -> List[T]:
+        """Sort items by the frecency of their path; unknown paths keep their order at the end."""
+        scores = self.scores()
+        if not scores:
+            return list(items)
+        return sorted(items, key=lambda item: -scores.get(key(item), 0.0))
@@ -0,0 +1,116 @@
+import os
+import glob
+import stat
+import tempfile
+import threading
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pynvim.api import Nvim
+
+from dev_utils.src.utils.nvim.connection import get_manager
+from dev_utils.src.utils.nvim.nvim_init import get_dev_socket, get_notes_socket
+
+
+def socket_patterns() -> List[str]:
+    """Glob patterns for the default server sockets Neovim creates (see :help serverstart())."""
+    tmp_dir = tempfile.gettempdir()
+    patterns = [
+        os.path.join(tmp_dir, f"nvim.{os.environ.get('USER', '*')}", "*", "nvim.*.0"),
+        os.path.join(tmp_dir, "nvim*", "0"),
+    ]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        patterns.insert(0, os.path.join(os.environ["XDG_RUNTIME_DIR"], "nvim.*.0"))
+    return patterns
+
+
+def is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def discover_sockets() -> Dict[str, str]:
+    """
+    Find the sockets of running Neovim instances.
+
+    The configured dev and notes sockets come first, followed by any default
+    server sockets found under $XDG_RUNTIME_DIR or the temp directory.
+
+    Returns:
+        Mapping of instance name to socket path
+    """
+    sockets = {}
+    seen = set()
+
+    def add(name: str, path: Optional[str]) -> None:
+        if not path or not is_socket(path):
+            return
+        real_path = os.path.realpath(path)
+        if real_path not in seen:
+            seen.add(real_path)
+            sockets[name] = path
+
+    add("dev", get_dev_socket())
+    add("notes", get_notes_socket())
+    for pattern in socket_patterns():
+        for path in sorted(glob.glob(pattern)):
+            add(os.path.basename(path) if path.endswith(".0") else path, path)
+
+    return sockets
+
+
+def query_instances(
+    sockets: Dict[str, str],
+    fetch: Callable[[Nvim], List[dict]],
+    timeout: float = 2.0,
+) -> Tuple[List[dict], Dict[str, str]]:
+    """
+    Run `fetch` against several Neovim instances concurrently.
+
+    Each instance is queried in its own daemon thread, so an editor that does
+    not answer within `timeout` seconds is skipped instead of stalling the
+    listing (or interpreter exit). A pooled connection found dead is
+    reconnected and `fetch` retried once.
+
+    Args:
+        sockets: Mapping of instance name to socket path
+        fetch: Function returning a list of dicts for one connection
+        timeout: Seconds to wait for all instances to answer
+
+    Returns:
+        Merged results, each tagged with "instance" and "socket", and a
+        mapping of instance name to error message for instances that failed
+    """
+    manager = get_manager()
+    answers: Dict[str, List[dict]] = {}
+    errors: Dict[str, str] = {}
+
+    def query(name: str, socket_path: str) -> None:
+        try:
+            answers[name] = manager.run(socket_path, fetch)
+        except Exception as e:
+            errors[name] = str(e) or type(e).__name__
+
+    threads = {
+        name: threading.Thread(target=query, args=(name, path), daemon=True)
+        for name, path in sockets.items()
+    }
+    for thread in threads.values():
+        thread.start()
+
+    deadline = monotonic() + timeout
+    for name, thread in threads.items():
+        thread.join(max(0.0, deadline - monotonic()))
+        if thread.is_alive():
+            errors[name] = f"timed out after {timeout}s"
+            manager.discard(sockets[name])
+
+    merged = []
+    for name, path in sockets.items():
+        if name in errors:
+            continue
+        for entry in answers.get(name, []):
+            merged.append({"instance": name, "socket": path, **entry})
+    return merged, errors
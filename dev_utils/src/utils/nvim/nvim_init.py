@@ -1,19 +1,24 @@
 import os
 import subprocess
-from libtmux import Server, Session, Window, Pane
-import pynvim
+from time import monotonic
+from typing import Callable, Dict, List, Optional
 
 from dev_utils.src.config import DEV_SOCKET_ENVVAR_NAME, NOTES_SOCKET_ENVVAR_NAME
+from dev_utils.src.utils.tmux.control import run_tmux
+
+# A resolver takes variable names and returns the values it could find
+Resolver = Callable[[List[str]], Dict[str, str]]
+
+ENV_CACHE_TTL = 30.0
+SOCKET_ENVVAR_NAMES = {
+    "NVIM_SOCKET_DEV": DEV_SOCKET_ENVVAR_NAME,
+    "NVIM_SOCKET_NOTES": NOTES_SOCKET_ENVVAR_NAME,
+}
 
 
 # Get Tmux envvar by name:
 def get_tmux_envvar(envvar_name):
-    cmd_list = ["tmux", "showenv", envvar_name]
-    output = subprocess.run(
-        cmd_list,
-        capture_output=True,
-        text=True,
-    )
+    output = run_tmux("showenv", envvar_name)
     if output.returncode != 0:
         print(f"Error: {output.stderr}")
     else:
@@ -24,14 +29,117 @@ def get_tmux_envvar(envvar_name):
     # return os.getenv(envvar_name)
 
 
+def tmux_environment(names: List[str]) -> Dict[str, str]:
+    """Resolve variables from the tmux session environment with one `tmux show-environment` call."""
+    try:
+        output = subprocess.run(
+            ["tmux", "show-environment"], capture_output=True, text=True
+        )
+    except OSError:
+        return {}
+    if output.returncode != 0:
+        return {}
+
+    wanted = set(names)
+    values = {}
+    for line in output.stdout.splitlines():
+        # Removed variables are listed as "-NAME"
+        name, sep, value = line.partition("=")
+        if sep and name in wanted:
+            values[name] = value.strip()
+    return values
+
+
+def os_environment(names: List[str]) -> Dict[str, str]:
+    """Resolve variables from this process's environment."""
+    return {name: os.environ[name] for name in names if name in os.environ}
+
+
+def chain_resolvers(*resolvers: Resolver) -> Resolver:
+    """Build a resolver that asks each resolver in turn for the names still missing."""
+
+    def resolve(names: List[str]) -> Dict[str, str]:
+        values = {}
+        for resolver in resolvers:
+            missing = [name for name in names if name not in values]
+            if not missing:
+                break
+            values.update(resolver(missing))
+        return values
+
+    return resolve
+
+
+_resolver: Resolver = chain_resolvers(tmux_environment, os_environment)
+_env_cache: Dict[str, str] = {}
+_env_cache_expires = 0.0
+
+
+def set_resolver(resolver: Resolver) -> None:
+    """Replace the resolver used for socket variables and drop cached values."""
+    global _resolver
+    _resolver = resolver
+    invalidate_env_cache()
+
+
+def invalidate_env_cache() -> None:
+    global _env_cache_expires
+    _env_cache.clear()
+    _env_cache_expires = 0.0
+
+
+def get_envvars(names: List[str], ttl: float = ENV_CACHE_TTL) -> Dict[str, str]:
+    """
+    Resolve variables, memoizing the result for `ttl` seconds.
+
+    The first lookup resolves the requested names together with both Neovim
+    socket variables, so a typical command makes a single resolver call.
+    """
+    global _env_cache_expires
+    names = [name for name in names if name]
+    now = monotonic()
+    if now >= _env_cache_expires:
+        _env_cache.clear()
+    missing = [name for name in names if name not in _env_cache]
+    if missing:
+        wanted = set(missing)
+        wanted.update(name for name in SOCKET_ENVVAR_NAMES.values() if name)
+        resolved = _resolver(sorted(wanted))
+        # Remember misses too, so an unset variable is not looked up again
+        _env_cache.update({name: resolved.get(name) for name in wanted})
+        if now >= _env_cache_expires:
+            _env_cache_expires = now + ttl
+    return {name: _env_cache[name] for name in names if _env_cache[name] is not None}
+
+
+def get_envvar(name: Optional[str]) -> Optional[str]:
+    """Resolve a single variable through the cached resolver."""
+    if not name:
+        return None
+    return get_envvars([name]).get(name)
+
+
+def get_dev_socket() -> Optional[str]:
+    """Socket path of the dev Neovim instance."""
+    return get_envvar(DEV_SOCKET_ENVVAR_NAME)
+
+
+def get_notes_socket() -> Optional[str]:
+    """Socket path of the notes Neovim instance."""
+    return get_envvar(NOTES_SOCKET_ENVVAR_NAME)
+
+
 # Set socket address for import
 def print_tmux_envvars():
-    output = get_tmux_envvar(DEV_SOCKET_ENVVAR_NAME)
+    output = get_dev_socket()
     print(f"\nDev Envvar Output: {output}")
 
-    output = get_tmux_envvar(NOTES_SOCKET_ENVVAR_NAME)
+    output = get_notes_socket()
     print(f"\nNotes Envvar Output: {output}\n")
 
 
-NVIM_SOCKET_DEV = get_tmux_envvar(DEV_SOCKET_ENVVAR_NAME)
-NVIM_SOCKET_NOTES = get_tmux_envvar(NOTES_SOCKET_ENVVAR_NAME)
+def __getattr__(name):
+    # NVIM_SOCKET_DEV / NVIM_SOCKET_NOTES used to be resolved at import time
+    if name in SOCKET_ENVVAR_NAMES:
+        return get_envvar(SOCKET_ENVVAR_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,27 +1,57 @@
 import typer
-from pynvim import attach
+from pynvim.api import NvimError
 from typing import List, Optional
 import inquirer
 from rich.console import Console
 from rich.table import Table
 
-from dev_utils.src.utils.nvim.nvim_init import NVIM_SOCKET_DEV, NVIM_SOCKET_NOTES
+from dev_utils.src.utils.nvim import buffer_daemon
+from dev_utils.src.utils.nvim.connection import get_connection, get_manager
+from dev_utils.src.utils.nvim.frecency import FrecencyStore
+from dev_utils.src.utils.nvim.instances import discover_sockets, query_instances
+from dev_utils.src.utils.nvim.nvim_init import get_dev_socket
 
 app = typer.Typer()
 console = Console()
 
+# Fetches every named, valid buffer in a single RPC request
+BUFFER_LIST_LUA = """
+local buffers = {}
+for _, buf in ipairs(vim.api.nvim_list_bufs()) do
+  if vim.api.nvim_buf_is_valid(buf) then
+    local name = vim.api.nvim_buf_get_name(buf)
+    if name ~= "" then
+      table.insert(buffers, {number = buf, name = name, modified = vim.bo[buf].modified})
+    end
+  end
+end
+return buffers
+"""
+
 
 def get_nvim_instance():
     """Connect to Neovim instance."""
     try:
-        return attach("socket", path=NVIM_SOCKET_DEV)
+        return get_connection(get_dev_socket())
     except Exception as e:
         console.print(f"[red]Error connecting to Neovim: {e}[/red]")
         raise typer.Exit(1)
 
 
-def get_buffer_list(nvim) -> List[dict]:
-    """Get list of all buffers with their details."""
+def get_buffer_list(nvim, batched: bool = True) -> List[dict]:
+    """
+    Get list of all buffers with their details.
+
+    By default all buffer metadata is fetched in one nvim_exec_lua request.
+    Neovim versions without Lua support fall back to per-buffer requests.
+    """
+    if batched:
+        try:
+            # An empty Lua table comes back as an empty dict
+            return list(nvim.exec_lua(BUFFER_LIST_LUA) or [])
+        except NvimError:
+            pass
+
     buffers = []
     for buf in nvim.buffers:
         if buf.valid and buf.name:  # Only include valid buffers with names
@@ -35,29 +65,85 @@ def get_buffer_list(nvim) -> List[dict]:
     return buffers
 
 
+def _daemon_buffer(state: dict, tag_instance: bool) -> dict:
+    buf = {
+        "number": state["number"],
+        "name": state["path"],
+        "modified": state["modified"],
+    }
+    if tag_instance:
+        buf.update(instance=state["instance"], socket=state["socket"])
+    return buf
+
+
+def fetch_buffers(
+    all_instances: bool = False, timeout: float = 2.0, use_daemon: bool = True
+) -> List[dict]:
+    """
+    Get buffers of the dev Neovim, or of every running Neovim instance.
+
+    The buffer daemon is asked first when it is running. Otherwise, with
+    all_instances, the instances are queried concurrently and each buffer is
+    tagged with the "instance" it belongs to. Instances the daemon has not
+    indexed (yet) are queried directly as well.
+    """
+    if not all_instances:
+        if use_daemon:
+            states = buffer_daemon.get_daemon_buffers("dev")
+            if states is not None:
+                return [
+                    _daemon_buffer(state, False) for state in states if state["path"]
+                ]
+        get_nvim_instance()  # Reports a dev Neovim that cannot be reached
+        return get_manager().run(get_dev_socket(), get_buffer_list)
+
+    sockets = discover_sockets()
+    buffers = []
+    if use_daemon:
+        indexed = buffer_daemon.get_daemon_index(sockets)
+        if indexed is not None:
+            states, sockets = indexed
+            buffers = [_daemon_buffer(state, True) for state in states if state["path"]]
+    if sockets:
+        found, errors = query_instances(sockets, get_buffer_list, timeout)
+        for instance, error in errors.items():
+            console.print(f"[yellow]Skipped instance {instance}: {error}[/yellow]")
+        buffers.extend(found)
+    return buffers
+
+
 def display_buffers(buffers: List[dict]):
     """Display buffers in a formatted table."""
+    show_instance = any("instance" in buf for buf in buffers)
     table = Table(show_header=True, header_style="bold magenta")
+    if show_instance:
+        table.add_column("Instance")
     table.add_column("Buffer #")
     table.add_column("File Path")
     table.add_column("Modified")
 
     for buf in buffers:
         modified = "[red]*[/red]" if buf["modified"] else ""
-        table.add_row(str(buf["number"]), buf["name"], modified)
+        row = [str(buf["number"]), buf["name"], modified]
+        if show_instance:
+            row.insert(0, buf.get("instance", ""))
+        table.add_row(*row)
 
     console.print(table)
 
 
+def buffer_label(buf: dict) -> str:
+    """Text shown for a buffer in the pickers."""
+    return (
+        (f"[{buf['instance']}] " if "instance" in buf else "")
+        + f"{buf['number']}: {buf['name']}"
+        + (" [*]" if buf["modified"] else "")
+    )
+
+
 def select_buffers(buffers: List[dict], multiple: bool = True) -> List[str]:
     """Prompt user to select buffer(s)."""
-    choices = [
-        (
-            f"{buf['number']}: {buf['name']}" + (" [*]" if buf["modified"] else ""),
-            buf["name"],
-        )
-        for buf in buffers
-    ]
+    choices = [(buffer_label(buf), buf["name"]) for buf in buffers]
 
     if multiple:
         questions = [
@@ -81,12 +167,60 @@ def select_buffers(buffers: List[dict], multiple: bool = True) -> List[str]:
     return [answers["selected"]]
 
 
+def fuzzy_select_buffers(buffers: List[dict], multiple: bool = True) -> List[str]:
+    """Pick buffer(s) with the incremental fuzzy picker, matching on file paths."""
+    # Imported here so the other commands do not pay for prompt_toolkit
+    from dev_utils.src.utils.picker import pick
+
+    positions = pick(
+        [buffer_label(buf) for buf in buffers],
+        multiple,
+        keys=[buf["name"] for buf in buffers],
+    )
+    return [buffers[position]["name"] for position in positions]
+
+
+def display_timings() -> None:
+    """Display connection handshake and RPC call timings per socket."""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Socket")
+    table.add_column("Connects")
+    table.add_column("Handshake (ms)")
+    table.add_column("Calls")
+    table.add_column("Call (ms)")
+
+    for socket_path, stats in get_manager().stats.items():
+        table.add_row(
+            str(socket_path),
+            str(stats.connects),
+            f"{stats.mean_handshake_ms:.2f}",
+            str(stats.calls),
+            f"{stats.mean_call_ms:.2f}",
+        )
+
+    console.print(table)
+
+
 @app.command()
-def list_buffers():
+def list_buffers(
+    timings: bool = typer.Option(
+        False, "--timings", help="Show connection and RPC call timings"
+    ),
+    all_instances: bool = typer.Option(
+        False, "--all-instances", "-a", help="List buffers of every running Neovim"
+    ),
+    timeout: float = typer.Option(
+        2.0, "--timeout", help="Seconds to wait for each instance with --all-instances"
+    ),
+    no_daemon: bool = typer.Option(
+        False, "--no-daemon", help="Query Neovim directly even if the daemon is running"
+    ),
+):
     """List all open Neovim buffers."""
-    nvim = get_nvim_instance()
-    buffers = get_buffer_list(nvim)
+    buffers = fetch_buffers(all_instances, timeout, not no_daemon)
     display_buffers(buffers)
+    if timings:
+        display_timings()
 
 
 @app.command()
@@ -94,24 +228,64 @@ def select(
     multiple: bool = typer.Option(
         True, "--multiple", "-m", help="Allow multiple buffer selection"
     ),
+    all_instances: bool = typer.Option(
+        False, "--all-instances", "-a", help="Select from every running Neovim"
+    ),
+    timeout: float = typer.Option(
+        2.0, "--timeout", help="Seconds to wait for each instance with --all-instances"
+    ),
+    no_daemon: bool = typer.Option(
+        False, "--no-daemon", help="Query Neovim directly even if the daemon is running"
+    ),
+    fuzzy: bool = typer.Option(
+        False, "--fuzzy", "-f", help="Use the incremental fuzzy picker"
+    ),
+    frecency: bool = typer.Option(
+        True,
+        "--frecency/--no-frecency",
+        help="Order buffers by how often and how recently they were picked",
+    ),
 ) -> None:
     """Select one or more buffers and return their file paths."""
-    nvim = get_nvim_instance()
-    buffers = get_buffer_list(nvim)
+    buffers = fetch_buffers(all_instances, timeout, not no_daemon)
 
     if not buffers:
         console.print("[yellow]No buffers found![/yellow]")
         raise typer.Exit(1)
 
-    display_buffers(buffers)
-    selected = select_buffers(buffers, multiple)
+    store = FrecencyStore()
+    if frecency:
+        buffers = store.rank(buffers, key=lambda buf: buf["name"])
+
+    if fuzzy:
+        selected = fuzzy_select_buffers(buffers, multiple)
+    else:
+        display_buffers(buffers)
+        selected = select_buffers(buffers, multiple)
 
     if selected:
+        store.record(selected)
         for path in selected:
             print(path)
     else:
         console.print("[yellow]No buffers selected![/yellow]")
 
 
+@app.command()
+def daemon(
+    socket_path: Optional[str] = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket to listen on (default: $XDG_RUNTIME_DIR/dev_utils-buffers.sock)",
+    ),
+) -> None:
+    """Keep an always-fresh buffer index of every Neovim instance for the other commands."""
+    try:
+        buffer_daemon.serve(socket_path)
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+
 if __name__ == "__main__":
     app()
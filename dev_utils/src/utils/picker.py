@@ -0,0 +1,135 @@
+from typing import List, Optional
+
+from prompt_toolkit.application import Application
+from prompt_toolkit.application.current import get_app
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import HSplit, Layout, Window
+from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+from prompt_toolkit.layout.processors import BeforeInput
+
+from dev_utils.src.utils.fuzzy import FuzzyIndex
+
+HELP = "tab: select  enter: accept  esc: cancel"
+
+
+def pick(
+    labels: List[str],
+    multiple: bool = True,
+    keys: Optional[List[str]] = None,
+    message: str = "> ",
+) -> List[int]:
+    """
+    Full-screen fuzzy picker.
+
+    Matching is incremental (see FuzzyIndex) and only the rows that fit on
+    screen are rendered, so each keystroke costs the same no matter how many
+    items there are.
+
+    Args:
+        labels: Text shown for each item
+        multiple: Allow selecting several items with tab
+        keys: Text matched against the query for each item. Defaults to labels
+        message: Prompt shown before the query
+
+    Returns:
+        Positions of the chosen items in labels; empty if cancelled
+    """
+    index = FuzzyIndex(keys or labels)
+    state = {"matches": index.search(""), "cursor": 0, "top": 0}
+    selected = set()
+
+    query = Buffer(multiline=False)
+
+    def on_query_changed(_):
+        state["matches"] = index.search(query.text)
+        state["cursor"] = 0
+        state["top"] = 0
+
+    query.on_text_changed += on_query_changed
+
+    def visible_rows() -> int:
+        return max(1, get_app().output.get_size().rows - 2)
+
+    def render_rows():
+        rows = visible_rows()
+        cursor = state["cursor"]
+        if cursor < state["top"]:
+            state["top"] = cursor
+        elif cursor >= state["top"] + rows:
+            state["top"] = cursor - rows + 1
+
+        top = state["top"]
+        fragments = []
+        for line, position in enumerate(state["matches"][top : top + rows], top):
+            style = "reverse" if line == cursor else ""
+            mark = "* " if position in selected else "  "
+            fragments.append((style, f"{mark}{labels[position]}\n"))
+        return fragments
+
+    def render_status():
+        counts = f" {len(state['matches'])}/{len(labels)}"
+        if multiple:
+            counts += f"  {len(selected)} selected"
+        return [("reverse", f"{counts}  ({HELP})")]
+
+    bindings = KeyBindings()
+
+    def move(offset: int) -> None:
+        last = len(state["matches"]) - 1
+        state["cursor"] = max(0, min(last, state["cursor"] + offset))
+
+    @bindings.add("up")
+    @bindings.add("c-p")
+    def _(event):
+        move(-1)
+
+    @bindings.add("down")
+    @bindings.add("c-n")
+    def _(event):
+        move(1)
+
+    @bindings.add("pageup")
+    def _(event):
+        move(-visible_rows())
+
+    @bindings.add("pagedown")
+    def _(event):
+        move(visible_rows())
+
+    @bindings.add("tab")
+    def _(event):
+        if multiple and state["matches"]:
+            position = state["matches"][state["cursor"]]
+            selected.symmetric_difference_update({position})
+            move(1)
+
+    @bindings.add("enter")
+    def _(event):
+        if selected:
+            event.app.exit(result=sorted(selected))
+        elif state["matches"]:
+            event.app.exit(result=[state["matches"][state["cursor"]]])
+        else:
+            event.app.exit(result=[])
+
+    @bindings.add("escape", eager=True)
+    @bindings.add("c-c")
+    def _(event):
+        event.app.exit(result=[])
+
+    layout = Layout(
+        HSplit(
+            [
+                Window(
+                    BufferControl(query, input_processors=[BeforeInput(message)]),
+                    height=1,
+                ),
+                Window(FormattedTextControl(render_status), height=1),
+                Window(FormattedTextControl(render_rows)),
+            ]
+        ),
+        focused_element=query,
+    )
+    app = Application(layout=layout, key_bindings=bindings, full_screen=True)
+    return app.run() or []
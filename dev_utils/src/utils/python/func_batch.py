@@ -0,0 +1,120 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dev_utils.src.utils.python.func_export import export_buffer
+from dev_utils.src.utils.python.func_index import FunctionTable, functions_from_source
+from dev_utils.src.utils.python.source_files import collect_python_files
+
+
+class FunctionFilter:
+    """
+    Select functions by name and decorator patterns.
+
+    Each kind of pattern that is given must match (AND); within one kind any
+    pattern may match (OR).
+
+    Args:
+        match: Glob patterns for the qualified name, e.g. "test_*" or "*.run"
+        regex: Regular expressions searched for in the qualified name
+        decorator: Glob patterns for a decorator's name without its call
+            arguments, e.g. "property" or "app.*"
+    """
+
+    def __init__(
+        self,
+        match: Sequence[str] = (),
+        regex: Sequence[str] = (),
+        decorator: Sequence[str] = (),
+    ):
+        self.match = list(match)
+        self.regex = [re.compile(pattern) for pattern in regex]
+        self.decorator = list(decorator)
+
+    def __bool__(self) -> bool:
+        return bool(self.match or self.regex or self.decorator)
+
+    def __call__(self, func: Dict) -> bool:
+        qualname = func["qualname"]
+        if self.match and not any(fnmatchcase(qualname, p) for p in self.match):
+            return False
+        if self.regex and not any(p.search(qualname) for p in self.regex):
+            return False
+        if self.decorator:
+            names = [d.split("(", 1)[0] for d in func["decorators"]]
+            if not any(fnmatchcase(n, p) for n in names for p in self.decorator):
+                return False
+        return True
+
+
+def collect_files(paths: Sequence[str]) -> List[Path]:
+    """Expand directories to the Python files below them; files are kept as given."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(collect_python_files(path))
+        else:
+            files.append(path)
+    return files
+
+
+def process_file(
+    file_path: Path, selector: FunctionFilter, export: bool = False
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Extract, filter and optionally export one file's functions from a single read.
+
+    Returns:
+        Records for the matching functions, and an error message if the file
+        could not be read
+    """
+    try:
+        with open(file_path, "rb") as file:
+            source = file.read()
+    except OSError as e:
+        return [], str(e)
+
+    table = FunctionTable()
+    table.add_file(str(file_path), functions_from_source(source))
+    functions = [table.row(position) for position in range(len(table))]
+    functions = [func for func in functions if selector(func)]
+    if export:
+        return list(export_buffer(str(file_path), source, functions)), None
+    return functions, None
+
+
+def run_batch(
+    files: List[Path],
+    selector: FunctionFilter,
+    export: bool = False,
+    jobs: int = 0,
+) -> Iterator[Tuple[Path, List[Dict], Optional[str]]]:
+    """
+    Process many files concurrently, yielding each file's results in file order.
+
+    Results are yielded as soon as the file and all files before it are done,
+    so output can be streamed while later files are still being parsed.
+
+    Args:
+        files: Python files to process
+        selector: Which functions to keep
+        export: Include each function's source, docstring and signature
+        jobs: Number of worker processes; 0 uses one per CPU
+    """
+    work = partial(process_file, selector=selector, export=export)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(files) > 1:
+        chunksize = max(1, min(16, len(files) // (jobs * 4)))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for file_path, (records, error) in zip(
+                files, pool.map(work, files, chunksize=chunksize)
+            ):
+                yield file_path, records, error
+    else:
+        for file_path in files:
+            records, error = work(file_path)
+            yield file_path, records, error
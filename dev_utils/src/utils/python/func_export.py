@@ -0,0 +1,138 @@
+import ast
+import mmap
+import textwrap
+from typing import Dict, Iterator, List, Optional, Union
+
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+def _line_offsets(buffer: Buffer, last_line: int) -> List[int]:
+    """Byte offsets of the starts of lines 1..last_line + 1."""
+    offsets = [0]
+    position = 0
+    while len(offsets) <= last_line:
+        newline = buffer.find(b"\n", position)
+        if newline < 0:
+            offsets.append(len(buffer))
+            break
+        position = newline + 1
+        offsets.append(position)
+    while len(offsets) <= last_line:
+        offsets.append(len(buffer))
+    return offsets
+
+
+def signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
+    """Render a function's def line without its body, e.g. "def f(a, b=1) -> int"."""
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    text = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        text += f" -> {ast.unparse(node.returns)}"
+    return text
+
+
+def _parse_function(source: str) -> Optional[ast.AST]:
+    """Parse one function's source, which may be indented (a method)."""
+    try:
+        body = ast.parse(textwrap.dedent(source)).body
+    except SyntaxError:
+        # E.g. a multi-line string in the body that is less indented than the def
+        return None
+    if body and isinstance(body[0], (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return body[0]
+    return None
+
+
+def _find_function(tree: ast.AST, lineno: int) -> Optional[ast.AST]:
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.lineno == lineno
+        ):
+            return node
+    return None
+
+
+def export_file(filepath: str, functions: List[Dict]) -> Iterator[Dict]:
+    """
+    Cut the source of functions out of one file, read once.
+
+    The line spans come from the function index, so only each function's own
+    source is parsed (for its docstring and signature). Only when that fails
+    is the whole buffer parsed, once. Large files are memory-mapped.
+
+    Args:
+        filepath: File the functions are defined in
+        functions: Function dicts from FunctionTable.row or extract_functions
+
+    Yields:
+        One record per function with its source, docstring and signature
+    """
+    with open(filepath, "rb") as file:
+        size = file.seek(0, 2)
+        file.seek(0)
+        if size >= MMAP_THRESHOLD:
+            buffer: Buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = file.read()
+
+    try:
+        yield from export_buffer(filepath, buffer, functions)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def export_buffer(
+    filepath: str, buffer: Buffer, functions: List[Dict]
+) -> Iterator[Dict]:
+    """export_file for a file whose contents were already read (or mapped)."""
+    if not functions:
+        return
+    last_line = max(func["end_lineno"] for func in functions)
+    offsets = _line_offsets(buffer, last_line)
+    tree = None
+    for func in functions:
+        start_line = func.get("start_lineno", func["lineno"])
+        source = buffer[offsets[start_line - 1] : offsets[func["end_lineno"]]].decode(
+            "utf-8", errors="replace"
+        )
+
+        node = _parse_function(source)
+        if node is None:
+            if tree is None:
+                try:
+                    tree = ast.parse(buffer[:])
+                except (SyntaxError, ValueError):
+                    tree = ast.Module(body=[], type_ignores=[])
+            node = _find_function(tree, func["lineno"])
+
+        yield {
+            "filepath": filepath,
+            "name": func["name"],
+            "qualname": func.get("qualname", func["name"]),
+            "lineno": func["lineno"],
+            "end_lineno": func["end_lineno"],
+            "decorators": func.get("decorators", []),
+            "is_async": func.get("is_async", False),
+            "signature": signature(node) if node is not None else None,
+            "docstring": ast.get_docstring(node) if node is not None else None,
+            "source": source,
+        }
+
+
+def export_functions(functions: List[Dict]) -> Iterator[Dict]:
+    """
+    Export functions from any number of files, reading each file once.
+
+    Records are yielded file by file (files in order of first appearance,
+    functions in the order given), so they can be streamed as they are cut.
+    """
+    by_file: Dict[str, List[Dict]] = {}
+    for func in functions:
+        by_file.setdefault(func["filepath"], []).append(func)
+    for filepath, file_functions in by_file.items():
+        yield from export_file(filepath, file_functions)
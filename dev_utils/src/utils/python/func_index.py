@@ -0,0 +1,173 @@
+import ast
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dev_utils.src.utils.python.source_files import collect_python_files, extract_all
+from dev_utils.src.utils.python.symbol_cache import SymbolCache
+
+CACHE_NAME = "func_index"
+# Includes the row layout version, so cached rows of an older layout are not used
+CACHE_KEY = "functions:2"
+
+# Bits of FunctionTable.flags
+ASYNC = 1
+METHOD = 2
+
+# One extracted function: qualified name, def line, last line, flags,
+# decorators, first line (the first decorator's line if it has decorators)
+Row = Tuple[str, int, int, int, List[str], int]
+
+
+def _decorator_name(node: ast.expr) -> str:
+    try:
+        return ast.unparse(node)
+    except Exception:
+        return type(node).__name__
+
+
+def functions_from_source(source: bytes) -> List[Row]:
+    """
+    Extract every function and method definition from Python source.
+
+    Names are qualified the way __qualname__ is: methods by their class
+    (Class.method), functions nested in functions with "<locals>"
+    (outer.<locals>.inner). Async definitions are included.
+
+    Returns:
+        Rows in source order; empty if the source does not parse
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    rows: List[Row] = []
+
+    def visit(body: List[ast.stmt], prefix: str, in_class: bool) -> None:
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = prefix + node.name
+                flags = (ASYNC if isinstance(node, ast.AsyncFunctionDef) else 0) | (
+                    METHOD if in_class else 0
+                )
+                rows.append(
+                    (
+                        qualname,
+                        node.lineno,
+                        node.end_lineno or node.lineno,
+                        flags,
+                        [_decorator_name(d) for d in node.decorator_list],
+                        min([d.lineno for d in node.decorator_list] + [node.lineno]),
+                    )
+                )
+                visit(node.body, f"{qualname}.<locals>.", False)
+            elif isinstance(node, ast.ClassDef):
+                visit(node.body, f"{prefix}{node.name}.", True)
+            else:
+                # Definitions inside if/try/with/for blocks keep the enclosing scope
+                for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+                    children = getattr(node, field, None)
+                    if isinstance(children, list):
+                        visit(
+                            [child for child in children if isinstance(child, ast.AST)],
+                            prefix,
+                            in_class,
+                        )
+
+    visit(tree.body, "", False)
+    return rows
+
+
+class FunctionTable:
+    """
+    Column-oriented table of functions across many files.
+
+    Line numbers, flags and file and decorator references are kept in typed
+    arrays, file paths and decorator lists are stored once and referenced by
+    position, so tens of thousands of functions take little memory and can
+    be filtered without building a dict per function.
+    """
+
+    def __init__(self):
+        self.files: List[str] = []
+        self.names: List[str] = []
+        self.file_ids = array("I")
+        self.linenos = array("I")
+        self.end_linenos = array("I")
+        self.start_linenos = array("I")
+        self.flags = array("B")
+        self.decorator_ids = array("I")
+        self.decorator_sets: List[Tuple[str, ...]] = [()]
+        self._decorator_positions: Dict[Tuple[str, ...], int] = {(): 0}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add_file(self, file_path: str, rows: List[Row]) -> None:
+        file_id = len(self.files)
+        self.files.append(file_path)
+        for qualname, lineno, end_lineno, flags, decorators, start_lineno in rows:
+            decorators = tuple(decorators)
+            decorator_id = self._decorator_positions.get(decorators)
+            if decorator_id is None:
+                decorator_id = self._decorator_positions[decorators] = len(
+                    self.decorator_sets
+                )
+                self.decorator_sets.append(decorators)
+            self.names.append(qualname)
+            self.file_ids.append(file_id)
+            self.linenos.append(lineno)
+            self.end_linenos.append(end_lineno)
+            self.start_linenos.append(start_lineno)
+            self.flags.append(flags)
+            self.decorator_ids.append(decorator_id)
+
+    def filepath(self, position: int) -> str:
+        return self.files[self.file_ids[position]]
+
+    def decorators(self, position: int) -> Tuple[str, ...]:
+        return self.decorator_sets[self.decorator_ids[position]]
+
+    def row(self, position: int) -> Dict:
+        """Return one function as a dict in the shape extract_functions uses."""
+        qualname = self.names[position]
+        return {
+            "name": qualname.rsplit(".", 1)[-1],
+            "qualname": qualname,
+            "lineno": self.linenos[position],
+            "end_lineno": self.end_linenos[position],
+            "start_lineno": self.start_linenos[position],
+            "is_async": bool(self.flags[position] & ASYNC),
+            "is_method": bool(self.flags[position] & METHOD),
+            "decorators": list(self.decorators(position)),
+            "filepath": self.filepath(position),
+        }
+
+
+def build_index(
+    root: Path,
+    cache: Optional[SymbolCache] = None,
+    jobs: int = 0,
+) -> FunctionTable:
+    """
+    Index every function below a directory.
+
+    Files found unchanged in the cache are not parsed; the rest are parsed in
+    a process pool when jobs > 1. Files appear in the table in the order
+    collect_python_files lists them.
+
+    Args:
+        root: Directory to scan
+        cache: Symbol cache to read from and update, if any
+        jobs: Number of worker processes; 0 uses one per CPU
+    """
+    files = collect_python_files(root)
+    results = extract_all(files, functions_from_source, cache, CACHE_KEY, jobs)
+    if cache is not None:
+        cache.save()
+
+    table = FunctionTable()
+    for file_path, rows in zip(files, results):
+        table.add_file(str(file_path), rows)
+    return table
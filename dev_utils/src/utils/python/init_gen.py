@@ -1,21 +1,58 @@
-import os
 from collections import defaultdict
+from enum import Enum
+from functools import partial
+from time import monotonic, sleep
 import ast
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, Set
 import typer
 from pathlib import Path
 from rich import print
+from rich.markup import escape
+
+from dev_utils.src.utils.python import source_files
+from dev_utils.src.utils.python.source_files import collect_python_files
+from dev_utils.src.utils.python.symbol_cache import SymbolCache
 
 app = typer.Typer()
 
+CACHE_NAME = "init_gen"
+CACHE_KEY = "names"
+
+
+class Engine(str, Enum):
+    WALK = "walk"
+    TOP_LEVEL = "top-level"
+
 
-def extract_names(file_path: str) -> Tuple[List[str], List[str]]:
+# Compound statements whose bodies still define module-level names
+MODULE_BLOCKS = (ast.If, ast.Try, getattr(ast, "TryStar", ast.Try))
+
+
+def extract_names(
+    file_path: str, engine: Engine = Engine.WALK
+) -> Tuple[List[str], List[str]]:
     """Extract class and function names from a Python file."""
-    with open(file_path, "r") as file:
-        try:
-            tree = ast.parse(file.read())
-        except SyntaxError:
-            return [], []
+    with open(file_path, "rb") as file:
+        return names_from_source(file.read(), engine)
+
+
+def names_from_source(
+    source: bytes, engine: Engine = Engine.WALK
+) -> Tuple[List[str], List[str]]:
+    """
+    Extract class and function names from Python source.
+
+    The walk engine visits every node, so methods and nested functions are
+    included. The top-level engine only looks at module-level statements,
+    which is cheaper and yields just the names a package can import.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return [], []
+
+    if engine == Engine.TOP_LEVEL:
+        return _top_level_names(tree.body)
 
     classes = []
     functions = []
@@ -30,6 +67,61 @@ def extract_names(file_path: str) -> Tuple[List[str], List[str]]:
     return classes, functions
 
 
+def _top_level_names(body: List[ast.stmt]) -> Tuple[List[str], List[str]]:
+    """Collect class and function definitions from module-level statements."""
+    classes = []
+    functions = []
+
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if not node.name.startswith("_"):
+                functions.append(node.name)
+        elif isinstance(node, MODULE_BLOCKS):
+            blocks = [node.body, node.orelse]
+            if not isinstance(node, ast.If):
+                blocks += [handler.body for handler in node.handlers]
+                blocks.append(node.finalbody)
+            for block in blocks:
+                block_classes, block_functions = _top_level_names(block)
+                classes.extend(block_classes)
+                functions.extend(block_functions)
+
+    return classes, functions
+
+
+def extract_all(
+    files: List[Path],
+    cache: Optional[SymbolCache] = None,
+    jobs: int = 1,
+    engine: Engine = Engine.WALK,
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    Extract class and function names for many files.
+
+    Files found unchanged in the cache are not parsed. The rest are parsed in
+    a process pool when jobs > 1. Results are returned in the order of files.
+
+    Args:
+        files: Python files to extract names from
+        cache: Symbol cache to read from and update, if any
+        jobs: Number of worker processes; 0 uses one per CPU
+        engine: Name extraction engine
+
+    Returns:
+        One (classes, functions) tuple per file
+    """
+    results = source_files.extract_all(
+        files,
+        partial(names_from_source, engine=engine),
+        cache,
+        f"{CACHE_KEY}:{engine.value}",
+        jobs,
+    )
+    return [(list(classes), list(functions)) for classes, functions in results]
+
+
 def get_relative_import_path(
     root_dir: Path, current_dir: Path, module_name: str = None
 ) -> str:
@@ -41,58 +133,122 @@ def get_relative_import_path(
     return "." + ".".join(parts) if parts else "."
 
 
-def process_directory(
-    root_dir: Path, current_dir: Path
+def build_imports(
+    root_dir: Path,
+    files: List[Path],
+    results: List[Tuple[List[str], List[str]]],
 ) -> Tuple[Dict[str, List[str]], List[str]]:
-    """Process all Python files in directory including __init__.py files."""
+    """Group extracted names by the module they are imported from."""
     imports_by_module = defaultdict(list)
     all_names = []
 
-    for item in current_dir.iterdir():
-        if item.is_file() and item.suffix == ".py":
-            if item.name == "__init__.py":
-                classes, functions = extract_names(item)
-                if (
-                    current_dir != root_dir
-                ):  # Skip root __init__.py to avoid circular imports
-                    module_path = get_relative_import_path(root_dir, current_dir)
-                    imports_by_module[module_path].extend(classes + functions)
-                all_names.extend(classes + functions)
-            else:
-                module_name = item.stem
-                classes, functions = extract_names(item)
-                if classes or functions:
-                    module_path = get_relative_import_path(
-                        root_dir, current_dir, module_name
-                    )
-                    imports_by_module[module_path].extend(classes + functions)
-                    all_names.extend(classes + functions)
-
-        elif item.is_dir() and not item.name.startswith("."):
-            sub_imports, sub_names = process_directory(root_dir, item)
-            for module, names in sub_imports.items():
-                imports_by_module[module].extend(names)
-            all_names.extend(sub_names)
+    for item, (classes, functions) in zip(files, results):
+        current_dir = item.parent
+        if item.name == "__init__.py":
+            # Skip root __init__.py to avoid circular imports, and empty ones
+            if current_dir != root_dir and (classes or functions):
+                module_path = get_relative_import_path(root_dir, current_dir)
+                imports_by_module[module_path].extend(classes + functions)
+            all_names.extend(classes + functions)
+        elif classes or functions:
+            module_path = get_relative_import_path(root_dir, current_dir, item.stem)
+            imports_by_module[module_path].extend(classes + functions)
+            all_names.extend(classes + functions)
 
     return imports_by_module, all_names
 
 
-@app.command()
-def generate(
-    directory: Path = typer.Argument(
-        ...,
-        exists=True,
-        file_okay=False,
-        dir_okay=True,
-        help="Directory to generate __init__.py for",
-    ),
-    dry_run: bool = typer.Option(
-        False, "--dry-run", "-d", help="Print output without writing to file"
-    ),
-):
-    """Generate __init__.py with imports for all Python files in directory."""
-    imports_by_module, all_names = process_directory(directory, directory)
+def process_directory(
+    root_dir: Path,
+    current_dir: Path,
+    cache: Optional[SymbolCache] = None,
+    jobs: int = 1,
+    engine: Engine = Engine.WALK,
+) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Process all Python files in directory including __init__.py files."""
+    files = collect_python_files(current_dir)
+    results = extract_all(files, cache, jobs, engine)
+    return build_imports(root_dir, files, results)
+
+
+def find_packages(root_dir: Path, files: List[Path]) -> Dict[Path, List[int]]:
+    """
+    Map each package directory to the positions of the files below it.
+
+    The root directory always counts as a package; subdirectories count when
+    they contain an __init__.py. Positions keep the order of files.
+    """
+    packages = {root_dir: []}
+    for path in files:
+        if path.name == "__init__.py":
+            packages.setdefault(path.parent, [])
 
+    for index, path in enumerate(files):
+        parent = path.parent
+        while True:
+            if parent in packages:
+                packages[parent].append(index)
+            if parent == root_dir:
+                break
+            parent = parent.parent
+
+    return packages
+
+
+def ancestors(root_dir: Path, path: Path) -> List[Path]:
+    """List the directories from a file's parent up to and including root_dir."""
+    parents = []
+    parent = path.parent
+    while True:
+        parents.append(parent)
+        if parent == root_dir or parent == parent.parent:
+            return parents
+        parent = parent.parent
+
+
+def render_inits(
+    root_dir: Path,
+    files: List[Path],
+    results: List[Tuple[List[str], List[str]]],
+    recursive: bool = False,
+    only: Optional[Set[Path]] = None,
+    lazy: bool = False,
+) -> Dict[Path, str]:
+    """
+    Render __init__.py contents from already extracted names.
+
+    Args:
+        root_dir: Top-level package directory
+        files: Python files below root_dir, as returned by collect_python_files
+        results: Extracted names for each file
+        recursive: Render an __init__.py for every package, not just root_dir
+        only: Restrict rendering to these package directories
+        lazy: Render lazy imports (see render_lazy_init)
+
+    Returns:
+        Mapping of __init__.py path to its content
+    """
+    if recursive:
+        packages = find_packages(root_dir, files)
+    else:
+        packages = {root_dir: range(len(files))}
+
+    render = render_lazy_init if lazy else render_init
+    inits = {}
+    for package_dir, positions in packages.items():
+        if only is not None and package_dir not in only:
+            continue
+        imports_by_module, all_names = build_imports(
+            package_dir,
+            [files[i] for i in positions],
+            [results[i] for i in positions],
+        )
+        inits[package_dir / "__init__.py"] = render(imports_by_module, all_names)
+    return inits
+
+
+def render_init(imports_by_module: Dict[str, List[str]], all_names: List[str]) -> str:
+    """Render the contents of an __init__.py from grouped imports."""
     # Remove duplicates while preserving order
     seen = set()
     all_names = [x for x in all_names if not (x in seen or seen.add(x))]
@@ -100,6 +256,8 @@ def generate(
     # Generate import strings
     import_strings = []
     for module, names in sorted(imports_by_module.items()):
+        if not names:
+            continue
         # Remove duplicates while preserving order
         unique_names = []
         seen = set()
@@ -107,25 +265,292 @@ def generate(
             if name not in seen:
                 unique_names.append(name)
                 seen.add(name)
+        separator = ",\n    "
         if len(unique_names) == 1:
             import_strings.append(f"from {module} import {unique_names[0]}")
         else:
             import_strings.append(
-                f"from {module} import (\n    {',\n    '.join(unique_names)},\n)"
+                f"from {module} import (\n    {separator.join(unique_names)},\n)"
             )
 
-    output = "\n".join(import_strings) + "\n\n" + f"__all__ = {all_names}"
+    return "\n".join(import_strings) + "\n\n" + f"__all__ = {all_names}"
+
+
+LAZY_INIT_TEMPLATE = """import importlib
+
+_LAZY_IMPORTS = {{
+{mapping}
+}}
+
+__all__ = {all_names}
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+"""
+
+
+def render_lazy_init(
+    imports_by_module: Dict[str, List[str]], all_names: List[str]
+) -> str:
+    """
+    Render an __init__.py that imports submodules on first attribute access.
+
+    Instead of import statements the file holds a name -> module table and a
+    module-level __getattr__ (PEP 562), so importing the package is cheap and
+    each submodule is only loaded when one of its names is used. As with the
+    eager form, a name exported by several modules resolves to the last one.
+    """
+    # Remove duplicates while preserving order
+    seen = set()
+    all_names = [x for x in all_names if not (x in seen or seen.add(x))]
+
+    lazy_imports = {}
+    for module, names in sorted(imports_by_module.items()):
+        for name in names:
+            lazy_imports[name] = module
+
+    mapping = "\n".join(
+        f"    {name!r}: {module!r}," for name, module in lazy_imports.items()
+    )
+    return LAZY_INIT_TEMPLATE.format(mapping=mapping, all_names=all_names)
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path unless it already holds exactly that. Returns True if written."""
+    try:
+        if path.read_text() == content:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.write_text(content)
+    return True
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SymbolIndex:
+    """
+    In-memory index of the names defined in every Python file below a root.
+
+    refresh() re-stats the tree and only re-extracts files whose mtime or
+    size changed, so it can be polled cheaply.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        cache: Optional[SymbolCache] = None,
+        jobs: int = 1,
+        engine: Engine = Engine.WALK,
+    ):
+        self.root_dir = root_dir
+        self.cache = cache
+        self.jobs = jobs
+        self.engine = engine
+        self.files: List[Path] = []
+        self.names: Dict[Path, Tuple[List[str], List[str]]] = {}
+        self._stats: Dict[Path, Optional[Tuple[int, int]]] = {}
+
+    def refresh(self) -> List[Path]:
+        """Rescan the tree and return the files that were added, changed or removed."""
+        files = collect_python_files(self.root_dir)
+        stats = {path: _stat_key(path) for path in files}
+
+        changed = [path for path in files if self._stats.get(path) != stats[path]]
+        removed = [path for path in self._stats if path not in stats]
+
+        results = extract_all(changed, self.cache, self.jobs, self.engine)
+        for path, names in zip(changed, results):
+            self.names[path] = names
+        for path in removed:
+            del self.names[path]
+
+        self.files = files
+        self._stats = stats
+        return changed + removed
+
+    def build_imports(self) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Group the indexed names the same way process_directory does."""
+        results = [self.names[path] for path in self.files]
+        return build_imports(self.root_dir, self.files, results)
+
+    def render(
+        self,
+        recursive: bool = False,
+        changed: Optional[List[Path]] = None,
+        lazy: bool = False,
+    ) -> Dict[Path, str]:
+        """Render __init__.py contents, limited to packages containing changed files if given."""
+        only = None
+        if changed is not None:
+            only = set()
+            for path in changed:
+                only.update(ancestors(self.root_dir, path))
+        results = [self.names[path] for path in self.files]
+        return render_inits(self.root_dir, self.files, results, recursive, only, lazy)
+
+
+def watch_directory(
+    directory: Path,
+    index: SymbolIndex,
+    interval: float = 0.5,
+    debounce: float = 1.0,
+    recursive: bool = False,
+    lazy: bool = False,
+) -> None:
+    """Keep __init__.py up to date, regenerating it when Python files below directory change."""
+    cache = index.cache
+
+    def write_inits(changed: Optional[List[Path]] = None) -> List[Path]:
+        """Write the affected __init__.py files; return other files changed meanwhile."""
+        written = [
+            init_path
+            for init_path, output in index.render(recursive, changed, lazy).items()
+            if write_if_changed(init_path, output)
+        ]
+        for init_path in written:
+            print(f"[green]Updated: {init_path}[/green]")
+        if not written:
+            return []
+        # Absorb our own writes, but keep edits that landed since rendering
+        return [path for path in index.refresh() if path not in written]
+
+    index.refresh()
+    if cache is not None:
+        cache.save()
+    pending = write_inits()
+    last_change = monotonic() if pending else None
+    print(f"[bold]Watching {directory} (Ctrl-C to stop)[/bold]")
+
+    try:
+        while True:
+            sleep(interval)
+            changed = index.refresh()
+            if changed:
+                pending.extend(changed)
+                last_change = monotonic()
+                for path in changed:
+                    print(f"[dim]Changed: {path}[/dim]")
+                continue
+            if last_change is None or monotonic() - last_change < debounce:
+                continue
+
+            pending = write_inits(pending)
+            last_change = monotonic() if pending else None
+            if cache is not None:
+                cache.save(prune=False)
+    except KeyboardInterrupt:
+        if cache is not None:
+            cache.save(prune=False)
+        print("\n[bold]Stopped watching[/bold]")
+
+
+@app.command()
+def generate(
+    directory: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Directory to generate __init__.py for",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", "-d", help="Print output without writing to file"
+    ),
+    recursive: bool = typer.Option(
+        False,
+        "--recursive",
+        "-r",
+        help="Also generate __init__.py for every subpackage (directories with an __init__.py)",
+    ),
+    lazy: bool = typer.Option(
+        False,
+        "--lazy",
+        help="Import submodules on first attribute access instead of eagerly",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Parse every file instead of using the symbol cache"
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", help="Parse files in N processes (0 = one per CPU)"
+    ),
+    engine: Engine = typer.Option(
+        Engine.WALK,
+        "--engine",
+        "-e",
+        help="walk: every class/def in the file; top-level: module-level definitions only",
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        file_okay=False,
+        dir_okay=True,
+        help="Directory for the symbol cache (default: $XDG_CACHE_HOME/dev_utils)",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        "-w",
+        help="Keep watching and regenerate __init__.py when Python files change",
+    ),
+    interval: float = typer.Option(
+        0.5, "--interval", "-i", help="With --watch, seconds between filesystem scans"
+    ),
+    debounce: float = typer.Option(
+        1.0,
+        "--debounce",
+        help="With --watch, seconds without further changes before __init__.py is rewritten",
+    ),
+):
+    """Generate __init__.py with imports for all Python files in directory."""
+    if watch and dry_run:
+        print("[red]Error: --dry-run cannot be combined with --watch[/red]")
+        raise typer.Exit(1)
+
+    cache = None if no_cache else SymbolCache(CACHE_NAME, directory, cache_dir)
+    if watch:
+        index = SymbolIndex(directory, cache, jobs, engine)
+        watch_directory(directory, index, interval, debounce, recursive, lazy)
+        return
+
+    files = collect_python_files(directory)
+    results = extract_all(files, cache, jobs, engine)
+    if cache is not None:
+        cache.save()
+
+    inits = render_inits(directory, files, results, recursive, lazy=lazy)
 
     if dry_run:
-        print("[bold]Generated __init__.py content:[/bold]")
-        print(output)
+        for init_path, output in inits.items():
+            name = init_path if recursive else "__init__.py"
+            print(f"[bold]Generated {name} content:[/bold]")
+            # The generated source is not markup: globals()[name] would be read as a tag
+            print(escape(output))
         return
 
-    init_path = directory / "__init__.py"
-    init_path.write_text(output)
-    print(f"\n{output}\n")
+    for init_path, output in inits.items():
+        if not write_if_changed(init_path, output):
+            print(f"[dim]Unchanged: {init_path}[/dim]")
+            continue
+        print(f"\n{escape(output)}\n")
 
-    print(f"[green]Successfully generated: {init_path}[/green]\n")
+        print(f"[green]Successfully generated: {init_path}[/green]\n")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,3 @@
-import ast
 import typer
 from typing import Dict, List, Optional
 from pathlib import Path
@@ -6,103 +5,451 @@ from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
 from prompt_toolkit import prompt
-from prompt_toolkit.completion import WordCompleter
+from time import perf_counter
 import json
+import re
+import sys
+
+from dev_utils.src.utils.fuzzy import FuzzyIndex
+
+from dev_utils.src.utils.python.func_batch import (
+    FunctionFilter,
+    collect_files,
+    run_batch,
+)
+from dev_utils.src.utils.python.func_export import export_buffer, export_functions
+from dev_utils.src.utils.python.func_index import (
+    CACHE_NAME,
+    FunctionTable,
+    build_index,
+    functions_from_source,
+)
+from dev_utils.src.utils.python.symbol_cache import SymbolCache
 
 app = typer.Typer()
 console = Console()
 
+PAGE_SIZE = 50
+
 
 def extract_functions(filepath: str) -> List[Dict]:
     """
     Extract all function definitions from a Python file.
     Returns a list of dictionaries containing function details.
+
+    Async functions are included and methods and nested functions are
+    qualified by their enclosing class or function (see func_index).
     """
-    with open(filepath, "r") as file:
-        tree = ast.parse(file.read())
+    with open(filepath, "rb") as file:
+        return functions_in_source(filepath, file.read())
 
-    functions = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            functions.append(
-                {"name": node.name, "lineno": node.lineno, "filepath": filepath}
-            )
+def functions_in_source(filepath: str, source: bytes) -> List[Dict]:
+    """extract_functions for a file whose contents were already read."""
+    table = FunctionTable()
+    table.add_file(filepath, functions_from_source(source))
+    return [table.row(position) for position in range(len(table))]
 
-    return functions
 
+def function_label(func: Dict, show_files: bool = False) -> str:
+    """Name shown for a function: async marker and qualified name."""
+    name = ("async " if func.get("is_async") else "") + func.get(
+        "qualname", func["name"]
+    )
+    return f"{name}  ({func['filepath']}:{func['lineno']})" if show_files else name
 
-def display_functions(functions: List[Dict]) -> None:
-    """Display the list of functions in a formatted table."""
+
+def display_functions(
+    functions: List[Dict],
+    show_files: bool = False,
+    positions: Optional[List[int]] = None,
+) -> None:
+    """
+    Display the list of functions in a formatted table.
+
+    Args:
+        functions: All functions; rows keep their 1-based index into this list
+        show_files: Add a column with each function's file
+        positions: Positions of the functions to show (one page). Defaults to all
+    """
     table = Table(show_header=True)
     table.add_column("Index", style="cyan")
     table.add_column("Function Name", style="green")
+    if show_files:
+        table.add_column("File", style="magenta")
     table.add_column("Line Number", style="yellow")
 
-    for idx, func in enumerate(functions, 1):
-        table.add_row(str(idx), func["name"], str(func["lineno"]))
+    if positions is None:
+        positions = range(len(functions))
+    for position in positions:
+        func = functions[position]
+        name = function_label(func)
+        if show_files:
+            table.add_row(
+                str(position + 1), name, func["filepath"], str(func["lineno"])
+            )
+        else:
+            table.add_row(str(position + 1), name, str(func["lineno"]))
 
     console.print(table)
 
 
-def get_user_selection(functions: List[Dict]) -> List[int]:
+def parse_selection(
+    text: str, count: int, view: Optional[List[int]] = None
+) -> List[int]:
+    """
+    Parse a selection of 1-based indices.
+
+    Accepts single indices ("3"), ranges ("3-40") and exclusions ("!7",
+    "!10-12"), separated by spaces or commas. If there are only exclusions
+    they apply to every function in `view` (the current filter), or to all.
+
+    Returns:
+        Selected indices in the order given, without duplicates
+
+    Raises:
+        ValueError: If a term is malformed or out of range
+    """
+    included: List[int] = []
+    excluded = set()
+    for term in text.replace(",", " ").split():
+        exclude = term.startswith("!")
+        start, sep, end = term.lstrip("!").partition("-")
+        first = int(start)
+        last = int(end) if sep else first
+        if not 1 <= first <= last <= count:
+            raise ValueError(f"{term} is not within 1-{count}")
+        if exclude:
+            excluded.update(range(first, last + 1))
+        else:
+            included.extend(range(first, last + 1))
+
+    if not included and excluded:
+        included = (
+            [position + 1 for position in view]
+            if view is not None
+            else list(range(1, count + 1))
+        )
+    return [idx for idx in dict.fromkeys(included) if idx not in excluded]
+
+
+def get_user_selection(
+    functions: List[Dict], show_files: bool = False, page_size: int = PAGE_SIZE
+) -> List[int]:
     """
     Get user selection of functions using prompt_toolkit.
     Returns a list of selected indices.
+
+    Only one page of functions is shown at a time. "/text" filters the list
+    by fuzzy match on the function names, "n" and "p" page through it.
     """
-    # Create a completer with valid indices
-    valid_indices = [str(i) for i in range(1, len(functions) + 1)]
-    completer = WordCompleter(valid_indices)
+    index = FuzzyIndex([func.get("qualname", func["name"]) for func in functions])
+    view = list(range(len(functions)))
+    page = 0
+
+    def show() -> None:
+        pages = max(1, -(-len(view) // page_size))
+        display_functions(
+            functions, show_files, view[page * page_size : (page + 1) * page_size]
+        )
+        rprint(
+            f"[dim]Page {page + 1}/{pages}, {len(view)} of {len(functions)} functions[/dim]"
+        )
 
+    show()
     while True:
         rprint(
-            "[yellow]Enter function indices separated by spaces (e.g., '1 3 4')[/yellow]"
+            "[yellow]Enter indices or ranges (e.g., '1 3-5 !4'), '/text' to filter, 'n'/'p' to page[/yellow]"
         )
-        selection = prompt("Selection: ", completer=completer).strip()
+        selection = prompt("Selection: ").strip()
 
-        try:
-            # Convert input to list of integers
-            indices = [int(idx) for idx in selection.split()]
+        if selection.startswith("/"):
+            view = index.search(selection[1:])
+            page = 0
+            show()
+            continue
+        if selection in ("n", "p"):
+            last_page = max(0, (len(view) - 1) // page_size)
+            page = min(last_page, page + 1) if selection == "n" else max(0, page - 1)
+            show()
+            continue
 
-            # Validate indices
-            if all(1 <= idx <= len(functions) for idx in indices):
+        try:
+            indices = parse_selection(selection, len(functions), view)
+            if indices:
                 return indices
-            else:
-                rprint("[red]Invalid selection. Please enter valid indices.[/red]")
+            rprint("[red]Invalid selection. Please enter valid indices.[/red]")
         except ValueError:
             rprint(
-                "[red]Invalid input. Please enter numbers separated by spaces.[/red]"
+                "[red]Invalid input. Please enter indices or ranges like '1 3-5 !4'.[/red]"
             )
 
 
+def fuzzy_select_functions(
+    functions: List[Dict], show_files: bool = False
+) -> List[int]:
+    """Pick functions with the incremental fuzzy picker; returns 1-based indices."""
+    # Imported here so the prompt-based selection does not load the picker
+    from dev_utils.src.utils.picker import pick
+
+    keys = [
+        (
+            f"{func['filepath']}:{func.get('qualname', func['name'])}"
+            if show_files
+            else func.get("qualname", func["name"])
+        )
+        for func in functions
+    ]
+    labels = [function_label(func, show_files) for func in functions]
+    return [position + 1 for position in pick(labels, multiple=True, keys=keys)]
+
+
+def benchmark_keystrokes(functions: List[Dict], count: int = 10000) -> Dict[str, float]:
+    """
+    Time filtering while a query is typed and erased, over `count` functions.
+
+    The extracted functions are repeated until there are `count` of them. Each
+    keystroke runs the incremental search and formats the first page of
+    matches, which is the work the pickers do per key.
+
+    Returns:
+        Mean and worst milliseconds per keystroke, and the number of keystrokes
+    """
+    names = [func.get("qualname", func["name"]) for func in functions] or ["function"]
+    names = [f"{names[i % len(names)]}_{i // len(names)}" for i in range(count)]
+    query = names[len(names) // 2][:12]
+    keystrokes = [query[:end] for end in range(1, len(query) + 1)]
+    keystrokes += keystrokes[-2::-1] + [""]
+
+    index = FuzzyIndex(names)
+    timings = []
+    for text in keystrokes:
+        start = perf_counter()
+        matches = index.search(text)
+        [f"{position + 1} {names[position]}" for position in matches[:PAGE_SIZE]]
+        timings.append((perf_counter() - start) * 1000)
+    return {
+        "mean_ms": sum(timings) / len(timings),
+        "max_ms": max(timings),
+        "keystrokes": len(timings),
+    }
+
+
+def write_export(
+    functions: List[Dict],
+    output: Optional[str],
+    jsonl: bool,
+    source: Optional[bytes] = None,
+) -> None:
+    """
+    Write the exported source of functions to a file or stdout.
+
+    With jsonl each record is written as soon as it is cut from its file, so
+    exporting many files never holds every function's source in memory.
+
+    Args:
+        source: Contents of the one file all functions come from, if already
+            read; otherwise each file is read once more
+    """
+    if source is not None:
+        records = export_buffer(functions[0]["filepath"], source, functions)
+    else:
+        records = export_functions(functions)
+    out = open(output, "w") if output else sys.stdout
+    try:
+        if jsonl:
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+        else:
+            json.dump({"selected_functions": list(records)}, out, indent=2)
+            out.write("\n")
+    finally:
+        if output:
+            out.close()
+    if output:
+        rprint(f"[green]Exported {len(functions)} functions to {output}[/green]")
+
+
+def write_batch(
+    paths: List[str],
+    selector: FunctionFilter,
+    output: Optional[str],
+    export: bool,
+    jobs: int,
+) -> None:
+    """
+    Select functions by pattern across many files and stream them as JSON Lines.
+
+    Each file's matches are written as soon as the file is processed; a
+    summary with the throughput in files per second goes to stderr.
+    """
+    errors = Console(stderr=True)
+    start = perf_counter()
+    files = collect_files(paths)
+    count = 0
+    out = open(output, "w") if output else sys.stdout
+    try:
+        for file_path, records, error in run_batch(files, selector, export, jobs):
+            if error:
+                errors.print(f"[red]Skipped {file_path}: {error}[/red]")
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+            count += len(records)
+    finally:
+        if output:
+            out.close()
+        else:
+            out.flush()
+
+    elapsed = perf_counter() - start
+    rate = len(files) / elapsed if elapsed > 0 else 0.0
+    errors.print(
+        f"[green]{len(files)} files, {count} functions in {elapsed:.2f} s "
+        f"({rate:.0f} files/s)[/green]"
+    )
+
+
 @app.command()
 def select_functions(
-    filepath: str = typer.Argument(..., help="Path to the Python file"),
+    paths: List[str] = typer.Argument(
+        ...,
+        help="Path to the Python file, or a directory to index every file below it. "
+        "With --match/--regex/--decorator, any number of files and directories",
+    ),
     output: Optional[str] = typer.Option(
         None, "--output", "-o", help="Output JSON file path"
     ),
+    match: List[str] = typer.Option(
+        [],
+        "--match",
+        "-m",
+        help="Select functions whose qualified name matches this glob (repeatable)",
+    ),
+    regex: List[str] = typer.Option(
+        [],
+        "--regex",
+        "-r",
+        help="Select functions whose qualified name matches this regex (repeatable)",
+    ),
+    decorator: List[str] = typer.Option(
+        [],
+        "--decorator",
+        "-d",
+        help="Select functions with a decorator matching this glob, e.g. 'property' (repeatable)",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every file instead of using the function index cache",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs",
+        "-j",
+        help="Parse files in N processes when indexing (0 = one per CPU)",
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        file_okay=False,
+        dir_okay=True,
+        help="Directory for the function index cache (default: $XDG_CACHE_HOME/dev_utils)",
+    ),
+    fuzzy: bool = typer.Option(
+        False, "--fuzzy", "-f", help="Use the incremental fuzzy picker"
+    ),
+    page_size: int = typer.Option(
+        PAGE_SIZE, "--page-size", help="Functions shown per page"
+    ),
+    export: bool = typer.Option(
+        False,
+        "--export",
+        "-x",
+        help="Include each selected function's source, docstring and signature",
+    ),
+    jsonl: bool = typer.Option(
+        False,
+        "--jsonl",
+        help="With --export, stream one JSON object per function (JSON Lines)",
+    ),
+    bench: int = typer.Option(
+        0,
+        "--bench",
+        metavar="N",
+        help="Benchmark filter latency per keystroke over N functions instead of selecting",
+    ),
 ) -> None:
     """
     List all functions in a Python file and allow multi-selection.
     Returns a dictionary of filepath and function names for selected functions.
+
+    Given a directory, every Python file below it is indexed (in parallel,
+    cached per file) and functions can be selected across all of them.
+
+    With --match, --regex or --decorator nothing is prompted: the matching
+    functions of every given file and directory are written as JSON Lines
+    to the output file or stdout. Different options must all match, repeats
+    of one option are alternatives.
     """
+    try:
+        selector = FunctionFilter(match, regex, decorator)
+    except re.error as e:
+        rprint(f"[red]Error: Invalid --regex: {e}[/red]")
+        raise typer.Exit(1)
+    if selector:
+        write_batch(paths, selector, output, export, jobs)
+        return
+
+    if len(paths) != 1:
+        rprint(
+            "[red]Error: Give one path, or select with --match/--regex/--decorator[/red]"
+        )
+        raise typer.Exit(1)
+    filepath = paths[0]
+    index_mode = Path(filepath).is_dir()
+
     # Validate file path
-    if not Path(filepath).exists() or not filepath.endswith(".py"):
+    if not index_mode and (not Path(filepath).exists() or not filepath.endswith(".py")):
         rprint("[red]Error: Invalid Python file path[/red]")
         raise typer.Exit(1)
 
     # Extract functions
-    functions = extract_functions(filepath)
+    if index_mode:
+        cache = None if no_cache else SymbolCache(CACHE_NAME, Path(filepath), cache_dir)
+        table = build_index(Path(filepath), cache, jobs)
+        functions = [table.row(position) for position in range(len(table))]
+        source = None
+    else:
+        # Kept so --export cuts the functions from this read
+        with open(filepath, "rb") as file:
+            source = file.read()
+        functions = functions_in_source(filepath, source)
 
     if not functions:
         rprint("[yellow]No functions found in the file.[/yellow]")
         raise typer.Exit(0)
 
-    # Display functions
-    display_functions(functions)
+    if bench:
+        timings = benchmark_keystrokes(functions, bench)
+        rprint(
+            f"{timings['keystrokes']} keystrokes over {bench} functions: "
+            f"mean {timings['mean_ms']:.2f} ms, worst {timings['max_ms']:.2f} ms"
+        )
+        return
 
     # Get user selection
-    selected_indices = get_user_selection(functions)
+    if fuzzy:
+        selected_indices = fuzzy_select_functions(functions, show_files=index_mode)
+        if not selected_indices:
+            rprint("[yellow]No functions selected.[/yellow]")
+            raise typer.Exit(0)
+    else:
+        selected_indices = get_user_selection(functions, index_mode, page_size)
+
+    selected = [functions[idx - 1] for idx in selected_indices]
+    if export:
+        write_export(selected, output, jsonl, source)
+        return
 
     # Create result dictionary
     result = {
@@ -112,6 +459,10 @@ def select_functions(
             for idx in selected_indices
         ],
     }
+    if index_mode:
+        for entry, idx in zip(result["selected_functions"], selected_indices):
+            entry["qualname"] = functions[idx - 1]["qualname"]
+            entry["filepath"] = functions[idx - 1]["filepath"]
 
     # Output results
     if output:
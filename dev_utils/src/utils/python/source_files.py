@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+from dev_utils.src.utils.python.symbol_cache import (
+    SymbolCache,
+    content_hash,
+    file_stat,
+)
+
+# Turns a file's source into the value cached for it; must be picklable
+# (a module-level function or a partial of one) to run in worker processes
+Extractor = Callable[[bytes], Any]
+
+
+def collect_python_files(current_dir: Path) -> List[Path]:
+    """List Python files below a directory in depth-first directory order."""
+    files = []
+    for item in current_dir.iterdir():
+        if item.is_file() and item.suffix == ".py":
+            files.append(item)
+        elif item.is_dir() and not item.name.startswith("."):
+            files.extend(collect_python_files(item))
+    return files
+
+
+def _extract_with_hash(
+    file_path: Path, extract: Extractor
+) -> Tuple[Any, str, Optional[Tuple[int, int]]]:
+    """
+    Extract a value from a file and hash its contents in a single read.
+
+    The file's (mtime_ns, size) is taken from the open file before reading,
+    so a save during extraction leaves the cached stat older than the file
+    and the next lookup re-checks it. An unreadable file is extracted as
+    empty source and gets an empty hash, so it is not cached.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            stat = file_stat(file.fileno())
+            source = file.read()
+    except OSError:
+        return extract(b""), "", None
+    return extract(source), content_hash(source), stat
+
+
+def extract_all(
+    files: List[Path],
+    extract: Extractor,
+    cache: Optional[SymbolCache] = None,
+    cache_key: str = "",
+    jobs: int = 1,
+) -> List[Any]:
+    """
+    Extract a value from the source of many files.
+
+    Files found unchanged in the cache are not read or parsed. The rest are
+    parsed in a process pool when jobs > 1. The cache is updated but not
+    saved; that is left to the caller.
+
+    Args:
+        files: Python files to extract from
+        extract: Function from a file's source to its value
+        cache: Symbol cache to read from and update, if any
+        cache_key: Key the values are cached under; include the value's version
+        jobs: Number of worker processes; 0 uses one per CPU
+
+    Returns:
+        One value per file, in the order of files. Cached values come back
+        as they were stored as JSON, so tuples are returned as lists
+    """
+    work = partial(_extract_with_hash, extract=extract)
+    results: List[Any] = [None] * len(files)
+    pending = []
+    for index, file_path in enumerate(files):
+        cached = cache.get(file_path, cache_key) if cache is not None else None
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.append(index)
+
+    jobs = jobs or os.cpu_count() or 1
+    pending_files = [files[index] for index in pending]
+    if jobs > 1 and len(pending) > 1:
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            extracted = list(pool.map(work, pending_files, chunksize=chunksize))
+    else:
+        extracted = [work(file_path) for file_path in pending_files]
+
+    for index, (value, digest, stat) in zip(pending, extracted):
+        results[index] = value
+        if cache is not None and digest:
+            cache.put(files[index], cache_key, value, digest, stat)
+
+    return results
@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory used when none is given."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "dev_utils"
+
+
+def content_hash(data: bytes) -> str:
+    """Hash file contents for change detection."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_stat(file: Union[str, int]) -> Tuple[int, int]:
+    """Return (mtime_ns, size) of a path or an open file descriptor."""
+    stat = os.fstat(file) if isinstance(file, int) else os.stat(file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SymbolCache:
+    """
+    On-disk cache of values extracted from source files.
+
+    Entries are keyed by absolute file path and validated against the file's
+    mtime and size first, then against a content hash, so unchanged files are
+    never re-read and touched-but-identical files are never re-parsed.
+
+    One cache file is kept per scanned root directory. Entries that were not
+    looked up or stored since the cache was loaded are evicted on save.
+    """
+
+    def __init__(self, name: str, root: Path, cache_dir: Optional[Path] = None) -> None:
+        """
+        Args:
+            name: Name of the tool using the cache, used in the file name
+            root: Directory being scanned; each root gets its own cache file
+            cache_dir: Directory holding cache files. Defaults to $XDG_CACHE_HOME/dev_utils
+        """
+        root_key = content_hash(os.path.abspath(root).encode())[:12]
+        self.path = Path(cache_dir or default_cache_dir()) / f"{name}-{root_key}.json"
+        self.stamp = f"{CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}"
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._used: Set[str] = set()
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.stamp:
+            # Written by another cache format or Python version, start over
+            self._dirty = True
+            return {}
+        return data.get("entries", {})
+
+    def get(self, file_path: Path, key: str) -> Optional[Any]:
+        """
+        Return the cached value stored under `key` for a file, or None.
+
+        The file is only read when its mtime or size changed since the value
+        was stored; if its content hash still matches, the entry is refreshed.
+        """
+        path = os.path.abspath(file_path)
+        entry = self.entries.get(path)
+        if entry is None or key not in entry["data"]:
+            return None
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            try:
+                with open(path, "rb") as f:
+                    digest = content_hash(f.read())
+            except OSError:
+                return None
+            if digest != entry["hash"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self._dirty = True
+
+        self._used.add(path)
+        return entry["data"][key]
+
+    def put(
+        self,
+        file_path: Path,
+        key: str,
+        value: Any,
+        digest: Optional[str] = None,
+        stat: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """
+        Store a value for a file under `key`.
+
+        Args:
+            file_path: File the value was extracted from
+            key: Name of the value, so one file can hold several kinds of results
+            value: JSON-serialisable value
+            digest: Content hash of the file, if the caller already computed it
+            stat: (mtime_ns, size) of the file taken before it was read for
+                `digest`. Without it the file is stat'ed now, which stores the
+                wrong stat if the file was saved since the caller read it
+        """
+        path = os.path.abspath(file_path)
+        try:
+            if digest is None:
+                with open(path, "rb") as f:
+                    stat = file_stat(f.fileno())
+                    digest = content_hash(f.read())
+            elif stat is None:
+                stat = file_stat(path)
+        except OSError:
+            return
+        mtime_ns, size = stat
+
+        entry = self.entries.get(path)
+        if entry is None or entry["hash"] != digest:
+            entry = {"data": {}}
+            self.entries[path] = entry
+        entry.update(mtime_ns=mtime_ns, size=size, hash=digest)
+        entry["data"][key] = value
+        self._used.add(path)
+        self._dirty = True
+
+    def save(self, prune: bool = True) -> None:
+        """
+        Write the cache to disk.
+
+        Args:
+            prune: Evict entries for files that were not seen since loading.
+                Only pass True after a full scan of the root directory.
+        """
+        if self._entries is None:
+            return
+        if prune:
+            stale = [path for path in self._entries if path not in self._used]
+            for path in stale:
+                del self._entries[path]
+            self._dirty = self._dirty or bool(stale)
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": self.stamp, "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        self._dirty = False
+
+    def clear(self) -> None:
+        """Drop all entries and remove the cache file."""
+        self._entries = {}
+        self._used.clear()
+        self._dirty = False
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,341 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import statistics
+import subprocess
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+app = typer.Typer()
+console = Console()
+
+DISTRIBUTION = "dev_utils"
+
+# Entry points that do real work when called and have no --help: only their module is imported
+IMPORT_ONLY = {"config", "tmux-vars"}
+
+# Run by another --python interpreter to list its installed console scripts
+CONSOLE_SCRIPTS_CODE = """
+import json
+from importlib import metadata
+try:
+    dist = metadata.distribution({name!r})
+except metadata.PackageNotFoundError:
+    print("[]")
+else:
+    print(json.dumps([
+        [ep.name, ep.value] for ep in dist.entry_points if ep.group == "console_scripts"
+    ]))
+"""
+
+
+def _console_scripts(python: str) -> List[Tuple[str, str]]:
+    """(name, "module:attr") of the console scripts installed for `python`."""
+    if python == sys.executable:
+        try:
+            dist = metadata.distribution(DISTRIBUTION)
+        except metadata.PackageNotFoundError:
+            return []
+        return [
+            (ep.name, ep.value)
+            for ep in dist.entry_points
+            if ep.group == "console_scripts"
+        ]
+
+    code = CONSOLE_SCRIPTS_CODE.format(name=DISTRIBUTION)
+    try:
+        result = subprocess.run([python, "-c", code], capture_output=True, text=True)
+        return [tuple(script) for script in json.loads(result.stdout)]
+    except (OSError, ValueError):
+        return []
+
+
+@lru_cache(maxsize=None)
+def entry_points(python: str = sys.executable) -> Dict[str, Tuple[str, str, bool]]:
+    """
+    List this distribution's console scripts from its installed metadata.
+
+    Args:
+        python: Interpreter whose environment is read, so --python benchmarks
+            the entry points installed there
+
+    Returns:
+        name -> (module, attribute, has --help)
+    """
+    scripts = {}
+    for name, value in _console_scripts(python):
+        module, _, attr = value.partition(":")
+        # Drop extras, e.g. "module:attr [extra]"
+        attr = attr.split("[")[0]
+        scripts[name] = (module.strip(), attr.strip(), name not in IMPORT_ONLY)
+    return scripts
+
+
+def build_command(name: str, python: str = sys.executable) -> List[str]:
+    """
+    Build the command used to time an entry point.
+
+    Entry points with a --help option are invoked with it; the others would
+    do real work when called, so only their module is imported.
+    """
+    module, attr, has_help = entry_points(python)[name]
+    if has_help:
+        code = (
+            f"import sys; sys.argv = [{name!r}, '--help']; "
+            f"from {module} import {attr}; {attr}()"
+        )
+    else:
+        code = f"import {module}"
+    return [python, "-c", code]
+
+
+def run_timed(
+    cmd: List[str], env: Optional[Dict[str, str]] = None
+) -> Tuple[float, int]:
+    """
+    Run a command to completion.
+
+    Returns:
+        Wall time in milliseconds and the child's peak RSS in kilobytes
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    _, _, usage = os.wait4(proc.pid, 0)
+    elapsed = (time.perf_counter() - start) * 1000
+    proc.returncode = 0  # Reaped by wait4; keep Popen from waiting again
+    return elapsed, usage.ru_maxrss
+
+
+def measure_import(
+    module: str, python: str = sys.executable, top: int = 10
+) -> Tuple[float, List[Dict]]:
+    """
+    Measure a module's import time with -X importtime.
+
+    Imports that the interpreter performs at startup anyway are left out.
+    The breakdown attributes time to each other top-level package (typer,
+    rich, pydantic, ...) at the point where it was first imported.
+
+    Returns:
+        Total import time in milliseconds and the slowest imported packages
+    """
+    startup = {name.strip() for name, _, _ in _importtime(python, "pass")}
+    rows = [
+        row
+        for row in _importtime(python, f"import {module}")
+        if row[0].strip() not in startup
+    ]
+
+    own_package = module.split(".")[0]
+    total = 0
+    by_package = {}
+    parents = []
+    # Rows are printed when an import finishes, so parents follow their children
+    for name, _, cumulative_us in reversed(rows):
+        depth = (len(name) - len(name.lstrip())) // 2
+        package = name.strip().split(".")[0]
+        del parents[depth:]
+        if depth == 0:
+            total += cumulative_us
+        if package != own_package and (not parents or parents[-1] != package):
+            by_package[package] = by_package.get(package, 0) + cumulative_us
+        parents.append(package)
+
+    breakdown = [
+        {"package": package, "cumulative_ms": cumulative_us / 1000}
+        for package, cumulative_us in sorted(
+            by_package.items(), key=lambda item: item[1], reverse=True
+        )
+    ]
+    return total / 1000, breakdown[:top]
+
+
+def _importtime(python: str, code: str) -> List[Tuple[str, int, int]]:
+    """Run code with -X importtime and parse (module, self us, cumulative us) rows."""
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", code], capture_output=True, text=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:       123 |        456 |   package.module"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        rows.append((name[1:], int(self_us), int(cumulative_us)))
+    return rows
+
+
+def benchmark_entry_point(
+    name: str, runs: int = 5, python: str = sys.executable
+) -> Dict:
+    """
+    Benchmark one entry point.
+
+    The cold run uses an empty bytecode cache (PYTHONPYCACHEPREFIX pointing at
+    a fresh directory) so every module is compiled; warm runs reuse it.
+    """
+    module, _, has_help = entry_points(python)[name]
+    cmd = build_command(name, python)
+    pycache = tempfile.mkdtemp(prefix="dev_utils_bench_")
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+
+    try:
+        cold_ms, cold_rss = run_timed(cmd, env)
+        warm = [run_timed(cmd, env) for _ in range(runs)]
+    finally:
+        shutil.rmtree(pycache, ignore_errors=True)
+
+    import_ms, breakdown = measure_import(module, python)
+    warm_ms = [elapsed for elapsed, _ in warm]
+    return {
+        "command": "--help" if has_help else "import",
+        "cold": {"wall_ms": cold_ms, "rss_kb": cold_rss},
+        "warm": {
+            "wall_ms": statistics.median(warm_ms),
+            "wall_ms_min": min(warm_ms),
+            "rss_kb": max(rss for _, rss in warm),
+            "runs": runs,
+        },
+        "import_ms": import_ms,
+        "top_imports": breakdown,
+    }
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float
+) -> List[Tuple[str, float, float]]:
+    """Return (entry point, baseline ms, current ms) for warm wall times that regressed past threshold."""
+    regressions = []
+    for name, result in current["entry_points"].items():
+        previous = baseline.get("entry_points", {}).get(name)
+        if previous is None:
+            continue
+        before = previous["warm"]["wall_ms"]
+        after = result["warm"]["wall_ms"]
+        if before and (after - before) / before > threshold:
+            regressions.append((name, before, after))
+    return regressions
+
+
+def display_results(results: Dict, baseline: Optional[Dict] = None) -> None:
+    """Display benchmark results in a formatted table."""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Entry point")
+    table.add_column("Command")
+    table.add_column("Cold (ms)", justify="right")
+    table.add_column("Warm (ms)", justify="right")
+    table.add_column("Import (ms)", justify="right")
+    table.add_column("Peak RSS (MB)", justify="right")
+    table.add_column("Slowest import")
+    if baseline:
+        table.add_column("vs baseline", justify="right")
+
+    for name, result in results["entry_points"].items():
+        slowest = ""
+        if result["top_imports"]:
+            heaviest = result["top_imports"][0]
+            slowest = f"{heaviest['package']} ({heaviest['cumulative_ms']:.0f} ms)"
+        row = [
+            name,
+            result["command"],
+            f"{result['cold']['wall_ms']:.1f}",
+            f"{result['warm']['wall_ms']:.1f}",
+            f"{result['import_ms']:.1f}",
+            f"{result['warm']['rss_kb'] / 1024:.1f}",
+            slowest,
+        ]
+        if baseline:
+            previous = baseline.get("entry_points", {}).get(name)
+            if previous and previous["warm"]["wall_ms"]:
+                change = result["warm"]["wall_ms"] / previous["warm"]["wall_ms"] - 1
+                color = "red" if change > 0 else "green"
+                row.append(f"[{color}]{change:+.0%}[/{color}]")
+            else:
+                row.append("")
+        table.add_row(*row)
+
+    console.print(table)
+
+
+@app.command()
+def run(
+    names: Optional[List[str]] = typer.Argument(
+        None, help="Entry points to benchmark (default: all)"
+    ),
+    runs: int = typer.Option(5, "--runs", "-n", help="Warm runs per entry point"),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Write results as JSON to this file"
+    ),
+    compare: Optional[Path] = typer.Option(
+        None,
+        "--compare",
+        "-c",
+        exists=True,
+        help="Baseline JSON results to compare against",
+    ),
+    threshold: float = typer.Option(
+        0.25,
+        "--threshold",
+        help="Fail when a warm wall time regresses by more than this fraction of the baseline",
+    ),
+    python: str = typer.Option(
+        sys.executable,
+        "--python",
+        help="Python interpreter to run entry points with (and read them from)",
+    ),
+) -> None:
+    """Measure cold/warm startup time, import time and peak RSS of each console entry point."""
+    scripts = entry_points(python)
+    if not scripts:
+        typer.echo(
+            f"Error: No console scripts found; is {DISTRIBUTION} installed (pip install -e .)?",
+            err=True,
+        )
+        raise typer.Exit(1)
+    names = names or list(scripts)
+    unknown = [name for name in names if name not in scripts]
+    if unknown:
+        typer.echo(f"Error: Unknown entry points: {', '.join(unknown)}", err=True)
+        raise typer.Exit(1)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "entry_points": {},
+    }
+    for name in names:
+        console.print(f"[dim]Benchmarking {name}...[/dim]")
+        results["entry_points"][name] = benchmark_entry_point(name, runs, python)
+
+    baseline = json.loads(compare.read_text()) if compare else None
+    display_results(results, baseline)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"[green]Results saved to {output}[/green]")
+
+    if baseline:
+        regressions = compare_results(baseline, results, threshold)
+        for name, before, after in regressions:
+            console.print(
+                f"[red]{name}: {before:.1f} ms -> {after:.1f} ms exceeds {threshold:.0%} threshold[/red]"
+            )
+        if regressions:
+            raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
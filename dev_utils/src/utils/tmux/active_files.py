@@ -0,0 +1,173 @@
+"""
+Find the files open in the Neovim instances running in tmux panes.
+
+Each pane is mapped to its Neovim server socket, and every server is asked
+for its current file over RPC at the same time. Nothing is typed into the
+panes.
+
+A pane is mapped through its @nvim_server pane option when Neovim has
+published it, e.g. from init.lua:
+
+    if vim.env.TMUX and vim.env.TMUX_PANE then
+      vim.fn.system({"tmux", "set-option", "-p", "-t", vim.env.TMUX_PANE,
+                     "@nvim_server", vim.v.servername})
+    end
+
+Otherwise the Neovim processes under the pane are matched against the
+default server sockets (nvim.<pid>.0) in $XDG_RUNTIME_DIR or the temp dir.
+"""
+
+import os
+import sys
+import glob
+import subprocess
+from typing import Dict, List, Set
+
+from dev_utils.src.utils.nvim.instances import (
+    is_socket,
+    query_instances,
+    socket_patterns,
+)
+from dev_utils.src.utils.tmux.snapshot import PaneRecord
+
+NVIM_COMMANDS = ("nvim",)
+
+
+def sockets_by_pid() -> Dict[int, str]:
+    """Map Neovim server pids to their default server sockets."""
+    sockets = {}
+    for pattern in socket_patterns():
+        for path in glob.glob(pattern):
+            # Default sockets are named nvim.<pid>.0
+            parts = os.path.basename(path).split(".")
+            if len(parts) == 3 and parts[1].isdigit() and is_socket(path):
+                sockets.setdefault(int(parts[1]), path)
+    return sockets
+
+
+def process_children() -> Dict[int, List[int]]:
+    """
+    Map each pid to its child pids, from one scan of /proc.
+
+    Without /proc (e.g. macOS) one `ps` call is used instead; if that fails
+    too the map is empty, so only published @nvim_server options are used.
+    """
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return _ps_children()
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is in parentheses and may contain spaces
+        fields = stat[stat.rfind(b")") + 2 :].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _ps_children() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    try:
+        output = subprocess.run(
+            ["ps", "-Ao", "pid=,ppid="], capture_output=True, text=True
+        ).stdout
+    except OSError:
+        return children
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[0].isdigit() and fields[1].isdigit():
+            children.setdefault(int(fields[1]), []).append(int(fields[0]))
+    return children
+
+
+def descendants(pid: int, children: Dict[int, List[int]]) -> List[int]:
+    """Return pid and all processes below it, parents first."""
+    result = []
+    stack = [pid]
+    seen: Set[int] = set()
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        result.append(current)
+        stack.extend(children.get(current, []))
+    return result
+
+
+def pane_servers(panes: List[PaneRecord]) -> Dict[str, str]:
+    """
+    Map pane ids to the sockets of the Neovim instances running in them.
+
+    /proc and the socket directories are only scanned when a Neovim pane
+    has not published its @nvim_server.
+    """
+    servers = {}
+    unpublished = []
+    for pane in panes:
+        if pane.nvim_server and is_socket(pane.nvim_server):
+            servers[pane.pane_id] = pane.nvim_server
+        elif pane.current_command in NVIM_COMMANDS:
+            unpublished.append(pane)
+
+    if unpublished:
+        sockets = sockets_by_pid()
+        children = process_children() if sockets else {}
+        for pane in unpublished:
+            # With a separate TUI process the server is a child of the
+            # Neovim started in the pane, so check every process below it
+            for pid in descendants(pane.pid, children):
+                if pid in sockets:
+                    servers[pane.pane_id] = sockets[pid]
+                    break
+    return servers
+
+
+def _current_file(nvim) -> List[dict]:
+    return [{"file_path": nvim.call("expand", "%:p")}]
+
+
+def find_active_files(
+    panes: List[PaneRecord], timeout: float = 2.0
+) -> List[Dict[str, str]]:
+    """
+    Ask every Neovim running in the given panes for its current file.
+
+    Each server is queried once, even when several panes map to it.
+
+    Returns:
+        One entry per pane with a session and window name, pane id, file
+        path and editor, in pane order; panes whose Neovim did not answer
+        are left out
+    """
+    servers = pane_servers(panes)
+    if not servers:
+        return []
+    sockets = {socket_path: socket_path for socket_path in servers.values()}
+    results, errors = query_instances(sockets, _current_file, timeout)
+    for socket_path, error in errors.items():
+        # stderr, so -f json output stays valid
+        print(f"Error getting file from {socket_path}: {error}", file=sys.stderr)
+
+    files = {result["socket"]: result["file_path"] for result in results}
+    active_files = []
+    for pane in panes:
+        socket_path = servers.get(pane.pane_id)
+        if files.get(socket_path):
+            active_files.append(
+                {
+                    "session_name": pane.window.session.name,
+                    "window_name": pane.window.name,
+                    "pane_id": pane.pane_id,
+                    "file_path": files[socket_path],
+                    "editor": pane.current_command,
+                    "socket": socket_path,
+                }
+            )
+    return active_files
@@ -0,0 +1,351 @@
+import os
+import atexit
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import monotonic, sleep
+from typing import Callable, Deque, List, Optional, Sequence
+
+COMMAND_TIMEOUT = 5.0
+# Set DEV_UTILS_TMUX_CONTROL=0 to always run tmux commands as subprocesses
+CONTROL_ENVVAR = "DEV_UTILS_TMUX_CONTROL"
+
+# Called with a notification's name without the "%" and its arguments,
+# e.g. ("window-pane-changed", ["@1", "%3"])
+Listener = Callable[[str, List[str]], None]
+
+
+class TmuxControlError(RuntimeError):
+    """The control-mode connection could not be used."""
+
+
+class TmuxCommandError(RuntimeError):
+    """A tmux command answered with %error."""
+
+
+class ControlResult:
+    __slots__ = ("ok", "lines")
+
+    def __init__(self, ok: bool, lines: List[str]):
+        self.ok = ok
+        self.lines = lines
+
+    def __repr__(self):
+        return f"ControlResult(ok={self.ok}, lines={self.lines!r})"
+
+
+def quote(arg: str) -> str:
+    """Quote one argument for the tmux command parser."""
+    escaped = (
+        arg.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("$", "\\$")
+        .replace("\n", "\\n")
+    )
+    return f'"{escaped}"'
+
+
+def command_line(args: Sequence[str]) -> str:
+    return " ".join(quote(str(arg)) for arg in args) + "\n"
+
+
+class TmuxControlClient:
+    """
+    Persistent `tmux -C` connection that runs commands without spawning tmux.
+
+    tmux answers every command with a %begin ... %end (or %error) block, in
+    the order the commands were written, so replies are matched to commands
+    first-in first-out. Blocks tmux marks with flags 0 did not come from
+    this client (the initial attach) and are not matched. Several commands
+    can be written at once with send_many and their replies awaited together.
+
+    Lines outside reply blocks are notifications (%session-changed,
+    %window-pane-changed, ...) and are passed to the listeners registered
+    with add_listener.
+    """
+
+    def __init__(self, socket_name: Optional[str] = None, tmux: str = "tmux"):
+        self.socket_name = socket_name
+        self.tmux = tmux
+        self._proc: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._pending: Deque[Future] = deque()
+        self._write_lock = threading.Lock()
+        self._attached: Future = Future()
+        self._closed = False
+        self._listeners: List[Listener] = []
+
+    def start(self, timeout: float = COMMAND_TIMEOUT) -> "TmuxControlClient":
+        """
+        Attach in control mode and wait until tmux has accepted the client.
+
+        Raises:
+            TmuxControlError: If tmux could not be started or refused to attach
+        """
+        args = [self.tmux]
+        if self.socket_name:
+            args += ["-L", self.socket_name]
+        # no-output: no %output for pane contents; ignore-size: do not resize windows
+        args += ["-C", "attach-session", "-f", "no-output,ignore-size"]
+        try:
+            self._proc = subprocess.Popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+        except OSError as e:
+            raise TmuxControlError(f"Could not start {self.tmux}: {e}") from e
+
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+        try:
+            self._attached.result(timeout)
+        except FutureTimeoutError:
+            self.close()
+            raise TmuxControlError(f"tmux did not attach within {timeout}s")
+        except TmuxControlError:
+            self.close()
+            raise
+        return self
+
+    @property
+    def alive(self) -> bool:
+        return (
+            not self._closed
+            and self._proc is not None
+            and self._proc.poll() is None
+            and self._attached.done()
+            and self._attached.exception() is None
+        )
+
+    def _read(self) -> None:
+        block_number = None
+        block_from_client = False
+        lines: List[str] = []
+        try:
+            for raw in self._proc.stdout:
+                line = raw.decode(errors="replace").rstrip("\r\n")
+                if block_number is not None:
+                    parts = line.split(" ")
+                    if parts[0] in ("%end", "%error") and parts[2:3] == [block_number]:
+                        ok = parts[0] == "%end"
+                        self._finish_block(block_from_client, ok, lines)
+                        block_number = None
+                    else:
+                        lines.append(line)
+                elif line.startswith("%begin "):
+                    parts = line.split(" ")
+                    block_number = parts[2]
+                    block_from_client = parts[3:4] == ["1"]
+                    lines = []
+                elif line.startswith("%exit"):
+                    break
+                else:
+                    self._handle_notification(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._fail_pending(TmuxControlError("tmux control connection closed"))
+
+    def _finish_block(self, from_client: bool, ok: bool, lines: List[str]) -> None:
+        if not from_client:
+            # The attach-session given on the command line
+            if not self._attached.done():
+                if ok:
+                    self._attached.set_result(True)
+                else:
+                    self._attached.set_exception(TmuxControlError("\n".join(lines)))
+            return
+        if self._pending:
+            self._pending.popleft().set_result(ControlResult(ok, lines))
+
+    def add_listener(self, listener: Listener) -> Callable[[], None]:
+        """
+        Call `listener` for every notification tmux sends.
+
+        Listeners run on the reader thread, so they must not wait for replies
+        to tmux commands themselves.
+
+        Returns:
+            A function that removes the listener
+        """
+        self._listeners.append(listener)
+
+        def remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove
+
+    def _handle_notification(self, line: str) -> None:
+        if not line.startswith("%"):
+            return
+        name, _, rest = line[1:].partition(" ")
+        args = rest.split(" ") if rest else []
+        for listener in list(self._listeners):
+            try:
+                listener(name, args)
+            except Exception as e:
+                print(f"tmux notification listener failed on %{name}: {e}")
+
+    def _fail_pending(self, error: Exception) -> None:
+        if not self._attached.done():
+            self._attached.set_exception(error)
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    def send_many(
+        self, commands: Sequence[Sequence[str]], timeout: float = COMMAND_TIMEOUT
+    ) -> List[ControlResult]:
+        """
+        Write several commands in one pipe write and wait for all their replies.
+
+        Raises:
+            TmuxControlError: If the connection is closed or tmux does not answer in time
+        """
+        if not self.alive:
+            raise TmuxControlError("tmux control connection is not running")
+        futures = []
+        with self._write_lock:
+            for _ in commands:
+                future = Future()
+                self._pending.append(future)
+                futures.append(future)
+            try:
+                self._proc.stdin.write(
+                    "".join(command_line(args) for args in commands).encode()
+                )
+            except OSError as e:
+                self.close()
+                raise TmuxControlError(f"tmux control connection closed: {e}") from e
+
+        deadline = monotonic() + timeout
+        try:
+            return [
+                future.result(max(0.0, deadline - monotonic())) for future in futures
+            ]
+        except FutureTimeoutError:
+            # Replies can no longer be matched to commands reliably
+            self.close()
+            raise TmuxControlError(f"tmux did not answer within {timeout}s")
+
+    def command(self, *args: str, timeout: float = COMMAND_TIMEOUT) -> List[str]:
+        """
+        Run one tmux command and return its output lines.
+
+        Raises:
+            TmuxCommandError: If tmux reports an error for the command
+        """
+        result = self.send_many([args], timeout)[0]
+        if not result.ok:
+            raise TmuxCommandError("\n".join(result.lines))
+        return result.lines
+
+    def run(
+        self, *args: str, timeout: float = COMMAND_TIMEOUT
+    ) -> subprocess.CompletedProcess:
+        """Run one tmux command and report it like subprocess.run(capture_output=True, text=True)."""
+        result = self.send_many([args], timeout)[0]
+        output = "".join(f"{line}\n" for line in result.lines)
+        return subprocess.CompletedProcess(
+            ["tmux", *args],
+            0 if result.ok else 1,
+            stdout=output if result.ok else "",
+            stderr="" if result.ok else output,
+        )
+
+    def close(self) -> None:
+        """Detach the control client."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._proc is None:
+            return
+        try:
+            # tmux detaches a control client when its input ends
+            self._proc.stdin.close()
+            self._proc.wait(timeout=1.0)
+        except (OSError, subprocess.TimeoutExpired):
+            self._proc.kill()
+        self._fail_pending(TmuxControlError("tmux control connection closed"))
+
+    def __enter__(self) -> "TmuxControlClient":
+        if self._proc is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_client: Optional[TmuxControlClient] = None
+_client_failed = False
+_client_lock = threading.Lock()
+
+
+def get_control_client() -> Optional[TmuxControlClient]:
+    """
+    Return the control client shared by all dev_utils commands.
+
+    Returns:
+        None when control mode is disabled or tmux refused the connection;
+        the attempt is not repeated within the same process
+    """
+    global _client, _client_failed
+    if os.environ.get(CONTROL_ENVVAR, "1").lower() in ("0", "false", "no"):
+        return None
+    with _client_lock:
+        if _client is not None and _client.alive:
+            return _client
+        if _client_failed:
+            return None
+        try:
+            _client = TmuxControlClient().start()
+        except TmuxControlError:
+            _client_failed = True
+            return None
+        atexit.register(_client.close)
+        return _client
+
+
+def run_tmux(
+    *args: str, timeout: float = COMMAND_TIMEOUT
+) -> subprocess.CompletedProcess:
+    """Run a tmux command over the control connection, or as a subprocess if that is unavailable."""
+    client = get_control_client()
+    if client is not None:
+        try:
+            return client.run(*args, timeout=timeout)
+        except TmuxControlError:
+            pass
+    return subprocess.run(["tmux", *args], capture_output=True, text=True)
+
+
+def wait_for_environment(
+    name: str,
+    target: Optional[str] = None,
+    timeout: float = 1.0,
+    interval: float = 0.01,
+) -> Optional[str]:
+    """
+    Poll a tmux session environment variable until it is set.
+
+    Returns:
+        The value, or None if it was not set within `timeout` seconds
+    """
+    args = ["show-environment"] + (["-t", target] if target else []) + [name]
+    deadline = monotonic() + timeout
+    while True:
+        output = run_tmux(*args)
+        name_found, sep, value = output.stdout.strip().partition("=")
+        if output.returncode == 0 and sep and name_found == name:
+            return value
+        if monotonic() >= deadline:
+            return None
+        sleep(interval)
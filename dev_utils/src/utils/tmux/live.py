@@ -0,0 +1,159 @@
+import threading
+from typing import Callable, List, Optional
+
+from dev_utils.src.utils.tmux.control import (
+    TmuxCommandError,
+    TmuxControlClient,
+    TmuxControlError,
+)
+from dev_utils.src.utils.tmux.snapshot import (
+    SNAPSHOT_FORMAT,
+    PaneRecord,
+    SessionRecord,
+    TmuxSnapshot,
+    WindowRecord,
+)
+
+# Notifications after which sessions, windows or panes may have been added,
+# removed or renamed, so the model is rebuilt from a new snapshot
+STRUCTURE_NOTIFICATIONS = {
+    "sessions-changed",
+    "session-renamed",
+    "window-add",
+    "window-close",
+    "window-renamed",
+    "unlinked-window-add",
+    "unlinked-window-close",
+    "unlinked-window-renamed",
+    "layout-change",
+}
+
+
+class LiveTmuxModel:
+    """
+    In-memory model of a tmux server kept current by control-mode notifications.
+
+    The model starts from one snapshot. Focus changes (%client-session-changed,
+    %session-window-changed, %window-pane-changed) update it in place and make
+    the affected session the current one; structural changes schedule a new
+    snapshot on a background thread. Asking for the current session, window
+    or pane therefore never queries tmux.
+    """
+
+    def __init__(self, client: TmuxControlClient):
+        self.client = client
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[["LiveTmuxModel"], None]] = []
+        self._stale = threading.Event()
+        self._closed = False
+
+        # Subscribed before the first snapshot so no change is missed;
+        # anything that arrives before it exists marks the model stale
+        self._snapshot: Optional[TmuxSnapshot] = None
+        self._remove_listener = client.add_listener(self._on_notification)
+        snapshot = self._take_snapshot()
+        current = snapshot.most_active
+        with self._lock:
+            self._snapshot = snapshot
+            self._current_session_id = current.session_id if current else None
+
+        self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._refresher.start()
+
+    @classmethod
+    def connect(cls, socket_name: Optional[str] = None) -> "LiveTmuxModel":
+        """Attach a dedicated control client and build the model on it."""
+        return cls(TmuxControlClient(socket_name).start())
+
+    def _take_snapshot(self) -> TmuxSnapshot:
+        return TmuxSnapshot(
+            self.client.command("list-panes", "-a", "-F", SNAPSHOT_FORMAT)
+        )
+
+    def add_listener(self, listener: Callable[["LiveTmuxModel"], None]) -> None:
+        """Call `listener` with the model after every change."""
+        self._listeners.append(listener)
+
+    def _changed(self) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"tmux model listener failed: {e}")
+
+    def _on_notification(self, name: str, args: List[str]) -> None:
+        # Runs on the control client's reader thread: never wait for tmux here
+        if name in STRUCTURE_NOTIFICATIONS:
+            self._stale.set()
+            return
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                self._stale.set()
+                return
+            if name == "client-session-changed" and len(args) >= 2:
+                # Another client switched to a session
+                if snapshot.session_by_id(args[1]) is None:
+                    self._stale.set()
+                self._current_session_id = args[1]
+            elif name == "session-window-changed" and len(args) >= 2:
+                if not snapshot.set_active_window(args[0], args[1]):
+                    self._stale.set()
+                self._current_session_id = args[0]
+            elif name == "window-pane-changed" and len(args) >= 2:
+                window = snapshot.window(args[0])
+                if window is None or not snapshot.set_active_pane(args[0], args[1]):
+                    self._stale.set()
+                else:
+                    self._current_session_id = window.session.session_id
+            else:
+                return
+        self._changed()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            self._stale.wait()
+            if self._closed:
+                return
+            # Cleared before fetching so changes during the fetch trigger another one
+            self._stale.clear()
+            try:
+                snapshot = self._take_snapshot()
+            except (TmuxCommandError, TmuxControlError):
+                return
+            with self._lock:
+                self._snapshot = snapshot
+                if snapshot.session_by_id(self._current_session_id or "") is None:
+                    current = snapshot.most_active
+                    self._current_session_id = current.session_id if current else None
+            self._changed()
+
+    @property
+    def snapshot(self) -> TmuxSnapshot:
+        with self._lock:
+            return self._snapshot
+
+    def current_session(self) -> Optional[SessionRecord]:
+        with self._lock:
+            return self._snapshot.session_by_id(self._current_session_id or "")
+
+    def current_window(self) -> Optional[WindowRecord]:
+        session = self.current_session()
+        return session.active_window if session else None
+
+    def current_pane(self) -> Optional[PaneRecord]:
+        window = self.current_window()
+        return window.active_pane if window else None
+
+    def close(self) -> None:
+        self._closed = True
+        self._remove_listener()
+        self._stale.set()
+        self.client.close()
+
+    def __enter__(self) -> "LiveTmuxModel":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
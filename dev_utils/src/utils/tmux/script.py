@@ -1,23 +1,25 @@
 from libtmux import Server, Session, Window, Pane
 import os
-import subprocess
 import argparse
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
 from dataclasses import dataclass
-from pydantic import BaseModel
-from time import sleep
+from time import perf_counter
 
-file_env_var = "ACTIVE_FILE"
+from dev_utils.src.utils.tmux.control import run_tmux, wait_for_environment
+from dev_utils.src.utils.tmux.live import LiveTmuxModel
+from dev_utils.src.utils.tmux.snapshot import TmuxSnapshot, take_snapshot
 
+file_env_var = "ACTIVE_FILE"
 
-class TmuxBase(BaseModel):
-    """Base class for tmux objects"""
 
-    class Config:
-        arbitrary_types_allowed = True
+# Set DEV_UTILS_STRICT=1 (or pass --strict) to validate records with pydantic
+STRICT_ENVVAR = "DEV_UTILS_STRICT"
+strict_mode = os.environ.get(STRICT_ENVVAR, "").lower() in ("1", "true", "yes")
 
 
-class SessionActivity(TmuxBase):
+@dataclass(slots=True)
+class SessionActivity:
     session_obj: Session
     name: str
     started: int
@@ -27,10 +29,8 @@ class SessionActivity(TmuxBase):
     window_activity: int
 
 
-SessionActivity.model_rebuild()
-
-
-class WindowActivity(TmuxBase):
+@dataclass(slots=True)
+class WindowActivity:
     window_obj: Window
     name: str
     activity: int
@@ -39,7 +39,17 @@ class WindowActivity(TmuxBase):
     pane_activity: int
 
 
-WindowActivity.model_rebuild()
+def activity_types(strict: Optional[bool] = None):
+    """
+    Return the (SessionActivity, WindowActivity) record types to build.
+
+    The pydantic models in tmux/strict.py are only imported in strict mode.
+    """
+    if strict_mode if strict is None else strict:
+        from dev_utils.src.utils.tmux import strict as strict_models
+
+        return strict_models.SessionActivity, strict_models.WindowActivity
+    return SessionActivity, WindowActivity
 
 
 def print_class_dict(class_obj):
@@ -49,19 +59,47 @@ def print_class_dict(class_obj):
     print(f"\n\n")
 
 
-def get_current_session(server: Server):
+def get_current_session(
+    server: Server, snapshot: Optional[TmuxSnapshot] = None
+) -> Session:
+    """
+    Return the session with the most recent activity, from a single tmux query.
+
+    In strict mode every session is validated through the pydantic records instead.
+
+    Args:
+        server: tmux server to look at
+        snapshot: Snapshot of the server already taken by the caller, if any
+    """
+    if strict_mode:
+        return get_current_session_legacy(server)
+    return get_current_session_snapshot(server, snapshot)
+
+
+def get_current_session_snapshot(
+    server: Server, snapshot: Optional[TmuxSnapshot] = None
+) -> Session:
+    """get_current_session through one list-panes snapshot, whatever the mode."""
+    session = (snapshot or take_snapshot(server)).most_active
+    if session is None:
+        raise IndexError("No tmux sessions found")
+    return session.to_session(server)
+
+
+def get_current_session_legacy(server: Server):
+    session_type = activity_types()[0]
     session_activity = []
     # print(f"\n\nPrinting Server Sessions:\n")
     for session in server.sessions:
         # print(f"\n\nSession: {session}")
-        session_data = SessionActivity(
+        session_data = session_type(
             session_obj=session,
             name=session.session_name,
-            started=session.start_time,
-            activity=session.session_activity,
-            created=session.session_created,
-            last_attached=session.session_last_attached,
-            window_activity=session.window_activity,
+            started=int(session.start_time or 0),
+            activity=int(session.session_activity or 0),
+            created=int(session.session_created or 0),
+            last_attached=int(session.session_last_attached or 0),
+            window_activity=int(session.window_activity or 0),
         )
         session_activity.append(session_data)
 
@@ -77,6 +115,131 @@ def get_current_session(server: Server):
     return latest_active_sesh[0].session_obj
 
 
+def benchmark_current_session(server: Server, iterations: int = 20) -> Dict[str, float]:
+    """
+    Time finding the most active session through the snapshot and the legacy path.
+
+    Returns:
+        Mean milliseconds per lookup for each path
+    """
+    timings = {}
+    for mode, find_session in (
+        ("snapshot", get_current_session_snapshot),
+        ("legacy", get_current_session_legacy),
+    ):
+        find_session(server)  # Warm up
+        start = perf_counter()
+        for _ in range(iterations):
+            find_session(server)
+        timings[mode] = (perf_counter() - start) * 1000 / iterations
+    return timings
+
+
+def run_benchmark(
+    iterations: int, sessions: int = 0, socket_name: Optional[str] = None
+) -> None:
+    """
+    Print benchmark_current_session timings.
+
+    With `sessions`, the benchmark runs against a throwaway tmux server with
+    that many sessions instead of the server given by `socket_name`.
+    """
+    if not sessions:
+        server = Server(socket_name=socket_name)
+    else:
+        server = Server(socket_name=f"dev_utils-bench-{os.getpid()}")
+        for number in range(sessions):
+            server.new_session(session_name=f"bench-{number}", attach=False)
+
+    try:
+        session_count = len(take_snapshot(server).sessions)
+        timings = benchmark_current_session(server, iterations)
+    finally:
+        if sessions:
+            server.kill()
+
+    print(
+        f"get_current_session over {session_count} sessions ({iterations} iterations):"
+    )
+    for mode, ms in timings.items():
+        print(f"  {mode:<9} {ms:8.2f} ms")
+    print(f"  speedup   {timings['legacy'] / timings['snapshot']:8.1f}x")
+
+
+def benchmark_records(iterations: int = 10000) -> Dict[str, float]:
+    """
+    Time building SessionActivity records with and without pydantic.
+
+    Returns:
+        Mean microseconds per record for each record type
+    """
+    session = Session(server=Server(), session_id="$0", session_name="bench")
+    timings = {}
+    for mode, strict in (("slots", False), ("pydantic", True)):
+        session_type = activity_types(strict)[0]
+        start = perf_counter()
+        for number in range(iterations):
+            session_type(
+                session_obj=session,
+                name="bench",
+                started=number,
+                activity=number,
+                created=number,
+                last_attached=number,
+                window_activity=number,
+            )
+        timings[mode] = (perf_counter() - start) * 1e6 / iterations
+    return timings
+
+
+def run_record_benchmark(iterations: int) -> None:
+    """Print import-time and per-record timings for the slots and pydantic records."""
+    # Imported here so the benchmark code is not loaded on every run
+    from dev_utils.src.utils.startup_bench import measure_import
+
+    print("Import time:")
+    for label, module in (
+        ("tmux-script", "dev_utils.src.utils.tmux.script"),
+        ("strict models", "dev_utils.src.utils.tmux.strict"),
+    ):
+        total_ms, breakdown = measure_import(module, top=3)
+        slowest = ", ".join(
+            f"{row['package']} {row['cumulative_ms']:.1f} ms" for row in breakdown
+        )
+        print(f"  {label:<14} {total_ms:8.1f} ms  ({slowest})")
+
+    timings = benchmark_records(iterations)
+    print(f"SessionActivity construction ({iterations} records):")
+    for mode, us in timings.items():
+        print(f"  {mode:<9} {us:8.2f} us/record")
+    print(f"  speedup   {timings['pydantic'] / timings['slots']:8.1f}x")
+
+
+def watch_active(socket_name: Optional[str] = None) -> None:
+    """Print the current session, window and pane whenever they change, until interrupted."""
+    last = [None]
+
+    def report(model: LiveTmuxModel) -> None:
+        pane = model.current_pane()
+        if pane is None or pane.pane_id == last[0]:
+            return
+        last[0] = pane.pane_id
+        window = pane.window
+        print(
+            f"{window.session.name}:{window.index}.{pane.index}  "
+            f"{window.name}  {pane.pane_id}  {pane.current_command}",
+            flush=True,
+        )
+
+    with LiveTmuxModel.connect(socket_name) as model:
+        model.add_listener(report)
+        report(model)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
 def get_current_window(session: Session):
     active_windows = []
     for window in session.windows:
@@ -116,22 +279,18 @@ def add_rpc_servername_to_tmux_envvars(pane: Pane, pane_name: str):
     command = f":lua vim.env.{pane_name} v:servername"
 
 
+def command_target(pane: Pane) -> str:
+    """The pane id (%N), which stays valid however panes and windows are moved or renamed."""
+    return pane.pane_id
+
+
 def send_command_back_to_tmux(pane: Pane, command: str):
     #    #command = lua_file_path_str
     # build_command = f":{command}"
-    session = "System"  # pane.session  # .session_name
-    window = "Dev Utils"  # pane.window  # .name
-    pane_name = 2
-
-    tmux_args = f"{session}:{window}.{pane_name}"
+    tmux_args = command_target(pane)
 
-    cmd_list = ["tmux", "send-keys", "-t", tmux_args, command, "Enter"]
-
-    output = subprocess.run(
-        cmd_list,
-        capture_output=True,
-        text=True,
-    )
+    # Written to the shared tmux control connection instead of spawning tmux
+    output = run_tmux("send-keys", "-t", tmux_args, command, "Enter")
     return output
 
 
@@ -148,12 +307,16 @@ def set_tmux_env_var_from_nvim(
     env_var: str,
     value: str = "echo v:servername",  # "vim.fn.expand('%:p')"
 ):
+    target = command_target(pane)
+    # Unset first so the wait below only succeeds once Neovim has set it again
+    run_tmux("set-environment", "-t", target, "-u", env_var)
     output = set_nvim_active_file_env_var(pane, env_var, value)
     print(f"\nOutput1: {output}\n\n")
     output2 = send_command_back_to_tmux(
         pane, f":terminal tmux setenv {env_var} ${env_var}"
     )
-    sleep(0.1)
+    if wait_for_environment(env_var, target=target) is None:
+        print(f"\nTimed out waiting for {env_var} to be set\n")
     output3 = tmux_send_enter(pane)
     print(f"\nOutput Enter: {output3}\n\n")
     # output2 = subprocess.run(
@@ -164,125 +327,48 @@ def set_tmux_env_var_from_nvim(
     return output2
 
 
-def get_active_files(session_name: str = None) -> List[Dict[str, str]]:
+def get_active_files(
+    session_name: str = None,
+    timeout: float = 2.0,
+    all_sessions: bool = False,
+    socket_name: Optional[str] = None,
+) -> List[Dict[str, str]]:
     """
     Get a list of active files in the specified tmux session or current session if none specified.
 
+    Every Neovim in the session is asked for its current file over RPC, all at
+    once (see tmux/active_files.py); no keys are sent to the panes.
+
     Args:
         session_name (str, optional): Name of tmux session to check. Defaults to current session.
+        timeout (float): Seconds to wait for the Neovim instances to answer.
+        all_sessions (bool): Check every pane of every session instead.
+        socket_name (str, optional): tmux server socket name (tmux -L).
 
     Returns:
         List[Dict[str, str]]: List of dictionaries containing window, pane, and file information
     """
-    server = Server()
-    # print(f"\nActive Session: {server.active_session}")
-    # print_class_dict(server)
-    # Get current session if no session name provided
+    # Imported here so commands that do not query Neovim do not load pynvim
+    from dev_utils.src.utils.tmux.active_files import find_active_files
+
+    server = Server(socket_name=socket_name)
+    snapshot = take_snapshot(server)
+    if all_sessions:
+        return find_active_files(snapshot.panes, timeout)
     if not session_name:
         try:
-            # active_session = server.active_session
-            # print(f"\nActive Session: {active_session}")
-            session = get_current_session(server)
-            print(f"\nCalculated Active Session: {session}")
+            current = get_current_session(server, snapshot)
         except IndexError:
             raise RuntimeError("No tmux sessions found")
+        session = snapshot.session_by_id(current.session_id)
+        if session is None:
+            raise RuntimeError(f"Session '{current.session_name}' not found")
     else:
-        session = server.find_where({"session_name": session_name})
+        session = snapshot.session(session_name)
         if not session:
             raise ValueError(f"Session '{session_name}' not found")
 
-    active_files = []
-
-    # Iterate through all windows and panes
-    active_pane = session.active_pane
-    active_window = session.active_window
-    print(f"\nActive Window: {active_window}\n")
-    print(f"\nActive Pane: {active_pane}\n")
-    active_panes = [p for p in active_window.panes]  # if p.pane_active == "1"]
-
-    dev_pane = active_panes[1]
-    # output = send_command_back_to_tmux(
-    #    dev_pane, "echo 'Hey'"
-    # )  # "echo vim.fn.expand('%:p')")
-    # output = set_nvim_active_file_env_var(dev_pane, "ACTIVE_FILE")
-
-    output = set_tmux_env_var_from_nvim(dev_pane, file_env_var)
-
-    # output = tmux_send_enter(dev_pane)
-
-    # .communicate()[0])
-    # output = dev_pane.send_keys(':terminal echo "vim.fn.expand(%:p)"', enter=True)
-    print(f"\nOutput: {output}\n\n")
-    # for pane in active_panes:
-    #    count += 1
-    #    print(f"\n\nPane {count}: ")
-    #    print_class_dict(pane)
-    # print(f"\nActive Buffer: {active_pane.buffer_name}\n")
-
-    # different_attrs = compare_objects(active_panes)
-    # print(f"\nDifferent Attributes in Panes:")
-    # for attr in different_attrs:
-    #    print(f"    {attr}")
-    return
-    # print_class_dict(dev_pane)
-    for window in session.windows:
-        # Print window object:
-        # print_class_dict(window)
-        # print(f"\nActive Window: {window.name}")
-        for pane in window.panes:
-            # Print pane object:
-            # print_class_dict(pane)
-            # Get pane current path
-            # pane_path = pane.current_path
-            # print(f"Pane: {pane}")
-            # for key, val in pane.__dict__.items():
-            #    print(f"   {key}: {val}")
-            # Get current command running in pane
-            pane_cmd = pane.current_command
-
-            # Look for vim/nvim processes and get their file
-            if pane_cmd in ["vim", "nvim"]:
-                try:
-                    # Send keys to get current file (works in normal mode)
-                    pane.send_keys(':echo expand("%:p")', enter=True)
-                    current_file = pane.cmd("capture-pane", "-p").stdout[-1]
-
-                    # Clear the command line
-                    pane.send_keys(':echo ""', enter=True)
-
-                    if current_file:
-                        active_files.append(
-                            {
-                                "window_name": window.name,
-                                "pane_id": pane.id,
-                                "file_path": current_file,  # os.path.join(pane_path, current_file),
-                                "editor": pane_cmd,
-                            }
-                        )
-                except Exception as e:
-                    print(f"Error getting file from vim/nvim: {e}")
-                    continue
-
-            # Check for other text editors or files open in less/more
-            elif pane_cmd in ["less", "more", "bat", "nano", "emacs"]:
-                try:
-                    process_info = pane.cmd(
-                        "list-processes", "-F", "#{pane_current_command}"
-                    ).stdout
-                    if process_info:
-                        active_files.append(
-                            {
-                                "window_name": window.name,
-                                "pane_id": pane.id,
-                                "file_path": process_info[0],
-                                "editor": pane_cmd,
-                            }
-                        )
-                except Exception as e:
-                    print(f"Error getting file from {pane_cmd}: {e}")
-                    continue
-
-    return active_files
+    return find_active_files(session.panes, timeout)
 
 
 def main():
@@ -297,13 +383,73 @@ def main():
         default="plain",
         help="Output format (default: plain)",
     )
+    parser.add_argument(
+        "-a",
+        "--all-sessions",
+        action="store_true",
+        help="Check the panes of every session",
+    )
+    parser.add_argument(
+        "-L",
+        "--socket-name",
+        help="tmux server socket name (defaults to the default server)",
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="Follow the current session/window/pane through tmux notifications",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=2.0,
+        help="Seconds to wait for the Neovim instances to answer (default: 2)",
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="N",
+        help="Compare the snapshot and legacy get_current_session over N iterations",
+    )
+    parser.add_argument(
+        "--bench-sessions",
+        type=int,
+        default=0,
+        metavar="K",
+        help="With --bench, use a throwaway tmux server with K sessions",
+    )
+    parser.add_argument(
+        "--bench-records",
+        type=int,
+        metavar="N",
+        help="Compare import time and construction of N slots and pydantic records",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help=f"Validate tmux records with pydantic (same as {STRICT_ENVVAR}=1)",
+    )
     args = parser.parse_args()
 
-    try:
-        files = get_active_files(args.session)
+    if args.strict:
+        global strict_mode
+        strict_mode = True
 
-        for file in files:
-            print(file)
+    try:
+        if args.watch:
+            watch_active(args.socket_name)
+            return 0
+        if args.bench_records:
+            run_record_benchmark(args.bench_records)
+            return 0
+        if args.bench:
+            run_benchmark(args.bench, args.bench_sessions, args.socket_name)
+            return 0
+
+        files = get_active_files(
+            args.session, args.timeout, args.all_sessions, args.socket_name
+        )
 
         if args.format == "json":
             import json
@@ -311,6 +457,7 @@ def main():
             print(json.dumps(files, indent=2))
         else:
             for file_info in files:
+                print(f"Session: {file_info['session_name']}")
                 print(f"Window: {file_info['window_name']}")
                 print(f"Pane: {file_info['pane_id']}")
                 print(f"File: {file_info['file_path']}")
@@ -0,0 +1,222 @@
+from typing import Dict, Iterable, List, Optional
+
+from libtmux import Server, Session
+from libtmux.formats import FORMAT_SEPARATOR
+
+SESSION_FIELDS = (
+    "session_id",
+    "session_name",
+    "session_created",
+    "session_activity",
+    "session_last_attached",
+    "session_attached",
+)
+WINDOW_FIELDS = (
+    "window_id",
+    "window_index",
+    "window_name",
+    "window_active",
+    "window_activity",
+)
+PANE_FIELDS = (
+    "pane_id",
+    "pane_index",
+    "pane_active",
+    "pane_pid",
+    "pane_current_command",
+    "pane_current_path",
+    # Set by Neovim to its v:servername, see tmux/active_files.py
+    "@nvim_server",
+)
+FIELDS = SESSION_FIELDS + WINDOW_FIELDS + PANE_FIELDS
+
+# One line per pane, fields separated the same way libtmux separates them
+SNAPSHOT_FORMAT = FORMAT_SEPARATOR.join(f"#{{{field}}}" for field in FIELDS)
+
+
+def _int(value: str) -> int:
+    return int(value) if value else 0
+
+
+class PaneRecord:
+    __slots__ = (
+        "pane_id",
+        "index",
+        "active",
+        "pid",
+        "current_command",
+        "current_path",
+        "nvim_server",
+        "window",
+    )
+
+    def __init__(self, values: List[str], window: "WindowRecord"):
+        self.pane_id = values[0]
+        self.index = _int(values[1])
+        self.active = values[2] == "1"
+        self.pid = _int(values[3])
+        self.current_command = values[4]
+        self.current_path = values[5]
+        self.nvim_server = values[6]
+        self.window = window
+
+    def __repr__(self):
+        return f"PaneRecord({self.pane_id} {self.current_command!r})"
+
+
+class WindowRecord:
+    __slots__ = ("window_id", "index", "name", "active", "activity", "panes", "session")
+
+    def __init__(self, values: List[str], session: "SessionRecord"):
+        self.window_id = values[0]
+        self.index = _int(values[1])
+        self.name = values[2]
+        self.active = values[3] == "1"
+        self.activity = _int(values[4])
+        self.panes: List[PaneRecord] = []
+        self.session = session
+
+    @property
+    def active_pane(self) -> Optional[PaneRecord]:
+        return next((pane for pane in self.panes if pane.active), None)
+
+    def __repr__(self):
+        return f"WindowRecord({self.window_id} {self.name!r})"
+
+
+class SessionRecord:
+    __slots__ = (
+        "session_id",
+        "name",
+        "created",
+        "activity",
+        "last_attached",
+        "attached",
+        "windows",
+    )
+
+    def __init__(self, values: List[str]):
+        self.session_id = values[0]
+        self.name = values[1]
+        self.created = _int(values[2])
+        self.activity = _int(values[3])
+        self.last_attached = _int(values[4])
+        self.attached = _int(values[5])
+        self.windows: List[WindowRecord] = []
+
+    @property
+    def active_window(self) -> Optional[WindowRecord]:
+        return next((window for window in self.windows if window.active), None)
+
+    @property
+    def panes(self) -> List[PaneRecord]:
+        return [pane for window in self.windows for pane in window.panes]
+
+    def to_session(self, server: Server) -> Session:
+        """Build the libtmux Session for this record without querying tmux again."""
+        return Session(
+            server=server,
+            session_id=self.session_id,
+            session_name=self.name,
+            session_created=str(self.created),
+            session_activity=str(self.activity),
+            session_last_attached=str(self.last_attached),
+            session_attached=str(self.attached),
+        )
+
+    def __repr__(self):
+        return f"SessionRecord({self.session_id} {self.name!r})"
+
+
+class TmuxSnapshot:
+    """Sessions, windows and panes of a tmux server at one point in time."""
+
+    __slots__ = ("sessions", "most_active", "_sessions", "_windows", "_panes")
+
+    def __init__(self, lines: Iterable[str]):
+        """
+        Parse `list-panes -a -F SNAPSHOT_FORMAT` output.
+
+        Sessions keep the order tmux lists them in; the most active session is
+        found while parsing (on ties the first one listed wins).
+        """
+        self.sessions: List[SessionRecord] = []
+        self.most_active: Optional[SessionRecord] = None
+        self._sessions: Dict[str, SessionRecord] = {}
+        self._windows: Dict[str, WindowRecord] = {}
+        self._panes: Dict[str, PaneRecord] = {}
+
+        sessions = self._sessions
+        windows = self._windows
+        session_end = len(SESSION_FIELDS)
+        window_end = session_end + len(WINDOW_FIELDS)
+        for line in lines:
+            values = line.split(FORMAT_SEPARATOR)
+            if len(values) != len(FIELDS):
+                continue
+
+            session = sessions.get(values[0])
+            if session is None:
+                session = sessions[values[0]] = SessionRecord(values[:session_end])
+                self.sessions.append(session)
+                if (
+                    self.most_active is None
+                    or session.activity > self.most_active.activity
+                ):
+                    self.most_active = session
+
+            window = windows.get(values[session_end])
+            if window is None:
+                window = windows[values[session_end]] = WindowRecord(
+                    values[session_end:window_end], session
+                )
+                session.windows.append(window)
+
+            pane = PaneRecord(values[window_end:], window)
+            window.panes.append(pane)
+            self._panes[pane.pane_id] = pane
+
+    def session(self, name: str) -> Optional[SessionRecord]:
+        return next(
+            (session for session in self.sessions if session.name == name), None
+        )
+
+    def session_by_id(self, session_id: str) -> Optional[SessionRecord]:
+        return self._sessions.get(session_id)
+
+    def window(self, window_id: str) -> Optional[WindowRecord]:
+        return self._windows.get(window_id)
+
+    def pane(self, pane_id: str) -> Optional[PaneRecord]:
+        return self._panes.get(pane_id)
+
+    def set_active_window(self, session_id: str, window_id: str) -> bool:
+        """Mark a session's active window; False if either is unknown."""
+        session = self._sessions.get(session_id)
+        if session is None or window_id not in self._windows:
+            return False
+        for window in session.windows:
+            window.active = window.window_id == window_id
+        return True
+
+    def set_active_pane(self, window_id: str, pane_id: str) -> bool:
+        """Mark a window's active pane; False if either is unknown."""
+        window = self._windows.get(window_id)
+        if window is None or pane_id not in self._panes:
+            return False
+        for pane in window.panes:
+            pane.active = pane.pane_id == pane_id
+        return True
+
+    @property
+    def panes(self) -> List[PaneRecord]:
+        return list(self._panes.values())
+
+
+def take_snapshot(server: Optional[Server] = None) -> TmuxSnapshot:
+    """Fetch every session, window and pane of a tmux server with one tmux call."""
+    server = server or Server()
+    proc = server.cmd("list-panes", "-a", "-F", SNAPSHOT_FORMAT)
+    if proc.stderr:
+        raise RuntimeError("\n".join(proc.stderr))
+    return TmuxSnapshot(proc.stdout)
@@ -0,0 +1,42 @@
+"""
+Pydantic-validated versions of the tmux activity records.
+
+Only imported in strict mode (tmux-script --strict or DEV_UTILS_STRICT=1), so
+the default path does not pay for importing pydantic or validating records.
+"""
+
+# Server must be importable here for model_rebuild() to resolve Session.server
+from libtmux import Server, Session, Window  # noqa: F401
+from pydantic import BaseModel
+
+
+class TmuxBase(BaseModel):
+    """Base class for tmux objects"""
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class SessionActivity(TmuxBase):
+    session_obj: Session
+    name: str
+    started: int
+    activity: int
+    created: int
+    last_attached: int
+    window_activity: int
+
+
+SessionActivity.model_rebuild()
+
+
+class WindowActivity(TmuxBase):
+    window_obj: Window
+    name: str
+    activity: int
+    created: int
+    last_attached: int
+    pane_activity: int
+
+
+WindowActivity.model_rebuild()